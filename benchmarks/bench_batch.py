@@ -0,0 +1,73 @@
+"""Benchmark batch prompt throughput against the stub model server.
+
+Starts ``stub_model_server.py`` in a child process, then answers the same
+prompts with the batch runner at several concurrency levels.
+
+    python benchmarks/bench_batch.py --prompts 100 --latency 0.2
+"""
+import argparse
+import asyncio
+import io
+import json
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def wait_for_server(url: str, timeout: float = 10.0) -> None:
+    """Poll the stub's model list until it answers."""
+    deadline = time.time() + timeout
+    while True:
+        try:
+            urllib.request.urlopen(f"{url}/models", timeout=1).read()
+            return
+        except OSError:
+            if time.time() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--prompts", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.2, help="stub seconds before the first token")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--port", type=int, default=11500)
+    args = parser.parse_args()
+
+    from desktop_ai.agent import ChatAgent
+    from desktop_ai.headless import BatchRunner
+
+    stub = subprocess.Popen([
+        sys.executable, str(ROOT / "benchmarks" / "stub_model_server.py"),
+        "--port", str(args.port), "--latency", str(args.latency)
+    ], stdout=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{args.port}/v1"
+    try:
+        wait_for_server(base_url)
+        lines = "\n".join(
+            json.dumps({"id": f"p{i}", "prompt": f"Classify log line {i}: disk usage at {i % 100}%"})
+            for i in range(args.prompts)
+        )
+        items = BatchRunner.read_items(io.StringIO(lines))
+
+        print(f"{args.prompts} prompts, {args.latency:.2f}s stub latency")
+        print(f"{'concurrency':>11} {'seconds':>9} {'prompts/s':>10} {'tokens/s':>10} {'failed':>7}")
+        for concurrency in args.concurrency:
+            # A fresh agent per run: its HTTP client belongs to one event loop
+            runner = BatchRunner(ChatAgent(base_url=base_url, model="stub"), concurrency)
+            stats = asyncio.run(runner.run(items, io.StringIO()))
+            print(f"{concurrency:>11} {stats.elapsed:>9.2f} {stats.completed / stats.elapsed:>10.2f} "
+                  f"{stats.output_tokens / stats.elapsed:>10.1f} {stats.failed:>7}")
+    finally:
+        stub.terminate()
+        stub.wait()
+
+
+if __name__ == "__main__":
+    main()
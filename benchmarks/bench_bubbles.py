@@ -0,0 +1,177 @@
+"""Benchmark creating and showing 1,000 chat message bubbles.
+
+Compares the old widget-per-message bubbles styled with per-widget
+stylesheets and fonts, the same widgets driven by object names and dynamic
+properties in one application stylesheet, and the current ChatWidget, which
+paints bubbles with shared fonts and no widgets at all.
+
+    python benchmarks/bench_bubbles.py --count 1000
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PyQt6.QtWidgets import (  # noqa: E402
+    QApplication, QFrame, QLabel, QHBoxLayout, QVBoxLayout, QScrollArea,
+    QWidget, QSpacerItem, QSizePolicy
+)
+from PyQt6.QtCore import Qt  # noqa: E402
+from PyQt6.QtGui import QFont  # noqa: E402
+
+# Bubble rules the shared-stylesheet variant adds to the application stylesheet
+BUBBLE_RULES = """
+QFrame#bubbleRow { background: transparent; border: none; }
+QFrame#bubble { color: #cdd6f4; border-radius: 15px; padding: 12px 16px; }
+QFrame#bubble[user="true"] { background-color: #45475a; border: 1px solid #6c7086; }
+QFrame#bubble[user="false"] { background-color: #313244; border: 1px solid #45475a; }
+QLabel#bubbleText { background: transparent; color: #cdd6f4; font-size: 14px; }
+QLabel#bubbleText[user="true"] { font-weight: 500; }
+"""
+
+
+def message_texts(count: int) -> list:
+    """Distinct short markdown messages, alternating user and assistant."""
+    return [
+        (f"Message {i}: a **short** answer with `code` and a few words to wrap.", i % 2 == 0)
+        for i in range(count)
+    ]
+
+
+def per_widget_bubble(text: str, is_user: bool, styler) -> QFrame:
+    """The old MessageBubble: three stylesheets and a new font per message."""
+    row = QFrame()
+    row.setStyleSheet("QFrame { background: transparent; border: none; }")
+    layout = QHBoxLayout(row)
+    layout.setContentsMargins(10, 5, 10, 5)
+    bubble = QFrame()
+    background, border = ("#45475a", "#6c7086") if is_user else ("#313244", "#45475a")
+    bubble.setStyleSheet(f"""
+        QFrame {{
+            background-color: {background};
+            color: #cdd6f4;
+            border-radius: 15px;
+            border: 1px solid {border};
+            padding: 12px 16px;
+        }}
+    """)
+    label = QLabel()
+    label.setWordWrap(True)
+    label.setTextFormat(Qt.TextFormat.RichText)
+    weight = " font-weight: 500;" if is_user else ""
+    label.setStyleSheet(f"background: transparent; color: #cdd6f4;{weight} font-size: 14px;")
+    label.setFont(QFont("Segoe UI", 10))
+    label.setText(styler.process_markdown(text))
+    QVBoxLayout(bubble).addWidget(label)
+    spacer = QSpacerItem(0, 0, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum)
+    if is_user:
+        layout.addItem(spacer)
+        layout.addWidget(bubble, 2)
+    else:
+        layout.addWidget(bubble, 2)
+        layout.addItem(spacer)
+    return row
+
+
+def shared_bubble(text: str, is_user: bool, styler, font: QFont) -> QFrame:
+    """The same bubble styled by object names and a ``user`` property."""
+    row = QFrame()
+    row.setObjectName("bubbleRow")
+    layout = QHBoxLayout(row)
+    layout.setContentsMargins(10, 5, 10, 5)
+    bubble = QFrame()
+    bubble.setObjectName("bubble")
+    bubble.setProperty("user", is_user)
+    label = QLabel()
+    label.setObjectName("bubbleText")
+    label.setProperty("user", is_user)
+    label.setWordWrap(True)
+    label.setTextFormat(Qt.TextFormat.RichText)
+    label.setFont(font)
+    label.setText(styler.process_markdown(text))
+    QVBoxLayout(bubble).addWidget(label)
+    spacer = QSpacerItem(0, 0, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum)
+    if is_user:
+        layout.addItem(spacer)
+        layout.addWidget(bubble, 2)
+    else:
+        layout.addWidget(bubble, 2)
+        layout.addItem(spacer)
+    return row
+
+
+def run_widgets(app, messages, make_bubble) -> float:
+    """Add bubble widgets to a scroll area and return ms until shown and laid out."""
+    area = QScrollArea()
+    area.setWidgetResizable(True)
+    area.resize(800, 600)
+    container = QWidget()
+    layout = QVBoxLayout(container)
+    area.setWidget(container)
+    area.show()
+    app.processEvents()
+
+    start = time.perf_counter()
+    for text, is_user in messages:
+        layout.addWidget(make_bubble(text, is_user))
+    app.processEvents()
+    area.viewport().repaint()
+    elapsed = (time.perf_counter() - start) * 1000
+    area.deleteLater()
+    app.processEvents()
+    return elapsed
+
+
+def run_chat_widget(app, messages) -> float:
+    """Add messages to a ChatWidget and return ms until shown and painted."""
+    from desktop_ai.ui.widgets import ChatWidget
+
+    widget = ChatWidget()
+    widget.resize(800, 600)
+    widget.show()
+    app.processEvents()
+
+    start = time.perf_counter()
+    widget.add_messages(messages)
+    app.processEvents()
+    widget.viewport().repaint()
+    elapsed = (time.perf_counter() - start) * 1000
+    widget.deleteLater()
+    app.processEvents()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1000, help="number of bubbles")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+
+    from desktop_ai.ui.styles import STYLESHEET
+    from desktop_ai.ui.widgets.chat_widget import MarkdownStyler
+
+    app.setStyleSheet(STYLESHEET + BUBBLE_RULES)
+    shared_font = QFont("Segoe UI", 10)
+
+    messages = message_texts(args.count)
+    print(f"Creating {args.count} bubbles")
+    print(f"{'':<26} {'ms':>10}")
+    elapsed = run_widgets(
+        app, messages, lambda text, is_user: per_widget_bubble(text, is_user, MarkdownStyler)
+    )
+    print(f"{'per-widget stylesheets':<26} {elapsed:>10.0f}")
+    elapsed = run_widgets(
+        app, messages, lambda text, is_user: shared_bubble(text, is_user, MarkdownStyler, shared_font)
+    )
+    print(f"{'shared stylesheet':<26} {elapsed:>10.0f}")
+    elapsed = run_chat_widget(app, messages)
+    print(f"{'ChatWidget (painted)':<26} {elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
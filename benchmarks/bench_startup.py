@@ -0,0 +1,99 @@
+"""Benchmark cold start: import time, time to tray icon and to first window.
+
+It also times opening the quick-ask popup, from the trigger until its
+input has focus.
+
+Every run starts a fresh interpreter so imports are cold. ``cold`` opens
+the main window right after the tray icon appears; ``warm`` waits for the
+idle warm-up to preload it first, as when the user clicks the tray icon a
+few seconds after login.
+
+    python benchmarks/bench_startup.py --runs 3
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def child(mode: str) -> None:
+    """Start the app in this process and print timestamps as JSON."""
+    stamps = {"start": time.time()}
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    sys.path.insert(0, str(ROOT))
+
+    from PyQt6.QtWidgets import QApplication, QSystemTrayIcon
+    from desktop_ai.ui import DesktopAI
+    stamps["imported"] = time.time()
+
+    # Offscreen platforms have no tray; the icon is still created and shown
+    QSystemTrayIcon.isSystemTrayAvailable = staticmethod(lambda: True)
+
+    app = QApplication(sys.argv)
+    desktop_ai = DesktopAI(app)
+    app.processEvents()
+    stamps["tray"] = time.time()
+
+    if mode == "warm":
+        while desktop_ai.main_window is None:
+            app.processEvents()
+            time.sleep(0.005)
+        stamps["warmed"] = time.time()
+
+    opened = time.time()
+    desktop_ai.quick_ask.popup()
+    app.processEvents()
+    stamps["quick"] = time.time() - opened
+    desktop_ai.quick_ask.hide()
+
+    shown = time.time()
+    desktop_ai._show_window()
+    app.processEvents()
+    stamps["window"] = time.time()
+    stamps["show"] = stamps["window"] - shown
+    print(json.dumps(stamps))
+
+
+def measure(mode: str) -> dict:
+    """Run one child and return phase durations in ms from process spawn."""
+    spawned = time.time()
+    output = subprocess.run(
+        [sys.executable, __file__, "--child", mode],
+        check=True, capture_output=True, text=True
+    ).stdout
+    stamps = json.loads(output.strip().splitlines()[-1])
+    return {
+        "interpreter": (stamps["start"] - spawned) * 1000,
+        "imports": (stamps["imported"] - stamps["start"]) * 1000,
+        "to tray": (stamps["tray"] - spawned) * 1000,
+        "quick ask": stamps["quick"] * 1000,
+        "show window": stamps["show"] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="runs per mode (median is reported)")
+    parser.add_argument("--child", choices=("cold", "warm"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return
+
+    columns = ("interpreter", "imports", "to tray", "quick ask", "show window")
+    print(f"{'':<6}" + "".join(f"{column:>14}" for column in columns) + "   (median ms)")
+    for mode in ("cold", "warm"):
+        runs = [measure(mode) for _ in range(args.runs)]
+        medians = [statistics.median(run[column] for run in runs) for column in columns]
+        print(f"{mode:<6}" + "".join(f"{value:>14.0f}" for value in medians))
+
+
+if __name__ == "__main__":
+    main()
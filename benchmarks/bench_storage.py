@@ -0,0 +1,138 @@
+"""Benchmark conversations.db size and read latency with and without compression.
+
+Builds a synthetic history (chat turns plus large tool outputs) twice, once
+stored as plain JSON and once through the compressed encoding, then compacts
+the compressed copy and reports file size and per-session read latency.
+
+    python benchmarks/bench_storage.py --size-mb 1024
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from desktop_ai.core.database import encode_message, decode_message  # noqa: E402
+from desktop_ai.services.maintenance_service import MaintenanceService  # noqa: E402
+
+SCHEMA = """
+CREATE TABLE agent_sessions (
+    session_id TEXT PRIMARY KEY,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE agent_messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    message_data TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX idx_agent_messages_session_id ON agent_messages (session_id, created_at);
+"""
+
+LOG_LINES = [
+    "INFO  service started on port {n}",
+    "DEBUG cache miss for key user:{n}",
+    "WARN  retrying request {n} after timeout",
+    "ERROR connection reset by peer (attempt {n})",
+    "-rw-r--r-- 1 user user {n} Jan  1 12:00 file_{n}.txt",
+]
+
+
+def synthetic_session(rng: random.Random, turns: int):
+    """Yield the messages of one synthetic conversation."""
+    for turn in range(turns):
+        yield {"role": "user", "content": f"Question {turn}: what does the log say?"}
+        output = "\n".join(
+            rng.choice(LOG_LINES).format(n=rng.randint(0, 99999))
+            for _ in range(rng.randint(20, 400))
+        )
+        yield {"type": "function_call_output", "call_id": f"call_{turn}", "output": output}
+        yield {
+            "role": "assistant",
+            "type": "message",
+            "content": [{"type": "output_text", "text": f"Summary of turn {turn}.", "annotations": []}],
+        }
+
+
+def build(db_path: str, size_mb: int, encode, seed: int = 7) -> list:
+    """Write sessions until the raw payload reaches ``size_mb``."""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    budget = size_mb * 1024 * 1024
+    written = 0
+    session_ids = []
+    while written < budget:
+        session_id = f"session-{len(session_ids):06d}"
+        session_ids.append(session_id)
+        conn.execute("INSERT INTO agent_sessions (session_id) VALUES (?)", (session_id,))
+        rows = []
+        for message in synthetic_session(rng, rng.randint(2, 10)):
+            data = encode(message)
+            written += len(json.dumps(message))
+            rows.append((session_id, data))
+        conn.executemany("INSERT INTO agent_messages (session_id, message_data) VALUES (?, ?)", rows)
+        conn.commit()
+    conn.close()
+    return session_ids
+
+
+def read_latency(db_path: str, session_ids: list, samples: int = 200) -> float:
+    """Median milliseconds to load and decode every message of a session."""
+    rng = random.Random(1)
+    conn = sqlite3.connect(db_path)
+    timings = []
+    for session_id in rng.sample(session_ids, min(samples, len(session_ids))):
+        start = time.perf_counter()
+        rows = conn.execute(
+            "SELECT message_data FROM agent_messages WHERE session_id = ? ORDER BY created_at",
+            (session_id,)
+        ).fetchall()
+        [decode_message(row[0]) for row in rows]
+        timings.append((time.perf_counter() - start) * 1000)
+    conn.close()
+    return statistics.median(timings)
+
+
+def report(label: str, db_path: str, session_ids: list) -> None:
+    size = os.path.getsize(db_path) / (1024 * 1024)
+    latency = read_latency(db_path, session_ids)
+    print(f"{label:<22} {size:10.1f} MB {latency:10.2f} ms/session")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=1024, help="raw history size to generate")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plain_db = os.path.join(tmp, "plain.db")
+        compressed_db = os.path.join(tmp, "compressed.db")
+
+        print(f"Generating {args.size_mb} MB of synthetic history...")
+        session_ids = build(plain_db, args.size_mb, json.dumps)
+        build(compressed_db, args.size_mb, encode_message)
+
+        print(f"{'':<22} {'size':>13} {'read':>18}")
+        report("plain JSON", plain_db, session_ids)
+        report("compressed", compressed_db, session_ids)
+
+        # Compress the plain copy in place, the way an upgraded install would
+        service = MaintenanceService()
+        service.db_path = plain_db
+        while service.compress_existing(batch_size=5000):
+            pass
+        service.vacuum()
+        report("plain -> maintenance", plain_db, session_ids)
+
+
+if __name__ == "__main__":
+    main()
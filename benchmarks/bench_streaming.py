@@ -0,0 +1,99 @@
+"""Benchmark rendering of a streamed response in the chat view.
+
+Streams a ~20 KB markdown answer into a ChatWidget a few characters at a
+time and flushes the view once per simulated frame, comparing the
+incremental renderer with re-rendering the whole message every frame.
+
+    python benchmarks/bench_streaming.py --size-kb 20
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+
+def synthetic_response(size: int) -> str:
+    """Markdown mixing prose, lists and code fences, about ``size`` bytes."""
+    parts = []
+    section = 0
+    while sum(len(part) for part in parts) < size:
+        section += 1
+        parts.append(
+            f"## Step {section}\n\n"
+            f"This step explains **part {section}** of the answer with some *emphasis* "
+            "and a bit of `inline code` so the paragraph wraps over several lines.\n\n"
+            "- first point\n- second point\n- third point\n\n"
+            "```python\n"
+            f"def step_{section}(value):\n"
+            "    result = value * 2\n"
+            "    return result\n"
+            "```\n\n"
+        )
+    return "".join(parts)[:size]
+
+
+def run(widget, app, text: str, chunk: int, per_frame: int, flush) -> list:
+    """Stream ``text`` and return the duration of every frame in ms."""
+    widget.clear_chat()
+    widget.begin_assistant_stream()
+    frames = []
+    deltas = [text[i:i + chunk] for i in range(0, len(text), chunk)]
+    for start in range(0, len(deltas), per_frame):
+        begin = time.perf_counter()
+        for delta in deltas[start:start + per_frame]:
+            widget._stream.renderer.append(delta)
+        flush()
+        widget.viewport().repaint()
+        app.processEvents()
+        frames.append((time.perf_counter() - begin) * 1000)
+    widget.finish_stream()
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-kb", type=int, default=20, help="response size")
+    parser.add_argument("--chunk", type=int, default=4, help="characters per streamed delta")
+    parser.add_argument("--per-frame", type=int, default=3, help="deltas received per frame")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+
+    from desktop_ai.ui.widgets import ChatWidget
+    from desktop_ai.ui.widgets.chat_widget import MarkdownStyler
+
+    widget = ChatWidget()
+    widget.resize(800, 600)
+    widget.show()
+    app.processEvents()
+
+    text = synthetic_response(args.size_kb * 1024)
+
+    def incremental():
+        widget._flush_stream()
+
+    def full_rerender():
+        message = widget._stream
+        document = widget.delegate._new_document(message)
+        document.setHtml(MarkdownStyler.to_html(message.renderer.text))
+        widget.delegate._streams[message.key] = [document, 0]
+        widget.delegate._heights.pop(message.key, None)
+        widget.delegate.sizeHintChanged.emit(widget.chat_model.index_of(message))
+        widget.scrollToBottom()
+
+    print(f"Streaming {len(text)} bytes in {args.chunk}-char deltas, {args.per_frame} per frame")
+    print(f"{'':<16} {'frames':>7} {'total ms':>10} {'worst ms':>10} {'mean ms':>9}")
+    for label, flush in (("full re-render", full_rerender), ("incremental", incremental)):
+        frames = run(widget, app, text, args.chunk, args.per_frame, flush)
+        total = sum(frames)
+        print(f"{label:<16} {len(frames):>7} {total:>10.0f} {max(frames):>10.2f} {total / len(frames):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""A stand-in for Ollama's OpenAI-compatible API with predictable timing.
+
+Answers ``/v1/chat/completions``, streaming or not, after a fixed first-token
+latency and at a fixed token rate, so the batch runner and API server can
+be exercised and timed without a real model.
+
+    python benchmarks/stub_model_server.py --port 11500 --latency 0.2
+    desktop-ai batch prompts.jsonl -o results.jsonl --model stub \\
+        --base-url http://127.0.0.1:11500/v1
+"""
+import argparse
+import json
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves one request; timing comes from the server's ``options``."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json({"object": "list", "data": [{"id": "stub", "object": "model"}]})
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json({"error": "not found"}, status=404)
+            return
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        prompt = self._last_user_text(request.get("messages", []))
+        words = f"Stub reply to: {prompt[:80]}".split()
+        words += ["lorem"] * max(0, self.server.options.words - len(words))
+        tokens = [word + " " for word in words]
+        usage = {
+            "prompt_tokens": sum(len(str(m.get("content", "")).split()) for m in request.get("messages", [])),
+            "completion_tokens": len(tokens),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        time.sleep(self.server.options.latency)
+        if request.get("stream"):
+            self._stream(request, tokens, usage)
+            return
+        time.sleep(len(tokens) / self.server.options.tokens_per_second)
+        self._send_json({
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "".join(tokens).strip()},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        })
+
+    def _stream(self, request, tokens, usage):
+        """Send the reply as server-sent events, one token per chunk."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+
+        def event(delta, finish_reason=None, **extra):
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": request.get("model", "stub"),
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                **extra,
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        delay = 1 / self.server.options.tokens_per_second
+        event({"role": "assistant", "content": ""})
+        for token in tokens:
+            time.sleep(delay)
+            event({"content": token})
+        include_usage = (request.get("stream_options") or {}).get("include_usage")
+        event({}, "stop", **({"usage": usage} if include_usage else {}))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+    def _send_json(self, data, status=200):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    @staticmethod
+    def _last_user_text(messages) -> str:
+        for message in reversed(messages):
+            if message.get("role") == "user":
+                content = message.get("content", "")
+                if isinstance(content, list):
+                    content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+                return str(content)
+        return ""
+
+
+def make_server(port: int, latency: float, tokens_per_second: float, words: int) -> ThreadingHTTPServer:
+    """Create a stub server on 127.0.0.1; call ``serve_forever`` to run it."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    server.daemon_threads = True
+    server.options = argparse.Namespace(latency=latency, tokens_per_second=tokens_per_second, words=words)
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0, help="generation speed")
+    parser.add_argument("--words", type=int, default=40, help="reply length in tokens")
+    args = parser.parse_args()
+
+    server = make_server(args.port, args.latency, args.tokens_per_second, args.words)
+    print(f"Stub model server on http://127.0.0.1:{args.port}/v1", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 """Agent module."""
 from .chat_agent import ChatAgent
+from .session import ChatSession
 
-__all__ = ["ChatAgent"]
+__all__ = ["ChatAgent", "ChatSession"]
@@ -1,66 +1,151 @@
 """Simplified chat agent."""
 import asyncio
 import uuid
-from typing import Optional
+from collections import OrderedDict
+from typing import AsyncIterator, List, Optional
 
-from agents import Agent, Runner, OpenAIChatCompletionsModel, SQLiteSession
+from agents import Agent, ModelSettings, Runner, OpenAIChatCompletionsModel
 from openai import AsyncOpenAI
+from openai.types.responses import ResponseTextDeltaEvent
 
-from ..core import config, OLLAMA_BASE_URL, API_KEY, DATABASE_PATH
+from ..core import config, OLLAMA_BASE_URL, API_KEY, DATABASE_PATH, MODEL_CACHE_SIZE
+from .session import ChatSession
 from .tools import ShellTool
 
 
 class ChatAgent:
-    """Simple chat agent wrapper."""
+    """Simple chat agent wrapper.
 
-    def __init__(self):
-        self.session: Optional[SQLiteSession] = None
+    The OpenAI client, the tool list and a model wrapper per recently used
+    model are created once and reused. Changing the model or the system
+    prompt only derives a new ``Agent`` from them, and the conversation
+    carries on in the same session.
+
+    The model's inference profile from config is sent with every request:
+    sampling options in the standard request fields, and the whole profile
+    as Ollama's native ``options`` and ``keep_alive`` in the request body.
+    """
+
+    # Tools are shared by every agent
+    _tools: Optional[List] = None
+
+    def __init__(self, base_url: str = OLLAMA_BASE_URL, model: Optional[str] = None):
+        self.base_url = base_url
+        self.model = model  # Overrides the configured model for this agent only
+        self.session: Optional[ChatSession] = None
+        self._client: Optional[AsyncOpenAI] = None
+        self._models: "OrderedDict[Optional[str], OpenAIChatCompletionsModel]" = OrderedDict()
         self._create_agent()
         self.reset()
 
-    def _create_agent(self):
-        """Create the agent with current configuration."""
-        model = OpenAIChatCompletionsModel(
-            model=config.model,
-            openai_client=AsyncOpenAI(
-                base_url=OLLAMA_BASE_URL, 
+    @classmethod
+    def _get_tools(cls) -> List:
+        """The shell tools, built on first use."""
+        if cls._tools is None:
+            cls._tools = ShellTool.get_tools()
+        return cls._tools
+
+    def _get_model(self, model_name: Optional[str]) -> OpenAIChatCompletionsModel:
+        """Get the cached wrapper for ``model_name``, creating it if needed."""
+        model = self._models.get(model_name)
+        if model is not None:
+            self._models.move_to_end(model_name)
+            return model
+        if self._client is None:
+            self._client = AsyncOpenAI(
+                base_url=self.base_url, 
                 api_key=API_KEY
-            ),
+            )
+        model = OpenAIChatCompletionsModel(model=model_name, openai_client=self._client)
+        self._models[model_name] = model
+        while len(self._models) > MODEL_CACHE_SIZE:
+            self._models.popitem(last=False)
+        return model
+
+    @staticmethod
+    def _model_settings(model_name: Optional[str]) -> ModelSettings:
+        """Request settings for ``model_name``'s inference profile."""
+        profile = config.get_profile(model_name)
+        extra_body = {}
+        if profile.options():
+            extra_body["options"] = profile.options()
+        if profile.keep_alive is not None:
+            extra_body["keep_alive"] = profile.native_keep_alive()
+        return ModelSettings(
+            temperature=profile.temperature,
+            top_p=profile.top_p,
+            max_tokens=profile.num_predict,
+            extra_body=extra_body or None,
+            extra_args={"seed": profile.seed} if profile.seed is not None else None,
         )
-        
-        # Get shell tools
-        shell_tools = ShellTool.get_tools()
-        
+
+    def _create_agent(self):
+        """Create the agent with current configuration."""
+        model_name = self.model or config.model
         self.agent = Agent(
             name="Assistant",
             instructions=config.system_prompt,
-            model=model,
-            tools=shell_tools,
+            model=self._get_model(model_name),
+            model_settings=self._model_settings(model_name),
+            tools=self._get_tools(),
         )
 
     def update_model(self, model_name: str):
-        """Update the model."""
+        """Switch models; the conversation continues with the new one."""
         config.model = model_name
-        self._create_agent()
-        self.reset()
+        if self.model:
+            self.model = model_name
+        self.agent = self.agent.clone(
+            model=self._get_model(model_name),
+            model_settings=self._model_settings(model_name)
+        )
+
+    def update_profile(self):
+        """Apply the current model's inference profile after it changed."""
+        self.agent = self.agent.clone(model_settings=self._model_settings(self.model or config.model))
 
     def update_system_prompt(self, system_prompt: str):
         """Update the system prompt."""
         config.system_prompt = system_prompt
-        self._create_agent()
+        self.agent = self.agent.clone(instructions=system_prompt)
 
     def reset(self):
         """Reset conversation."""
-        self.session = SQLiteSession(str(uuid.uuid4()), str(DATABASE_PATH))
+        self.session = ChatSession(str(uuid.uuid4()), str(DATABASE_PATH))
 
     def load_session(self, session_id: str):
         """Load existing session."""
-        self.session = SQLiteSession(session_id, str(DATABASE_PATH))
+        self.session = ChatSession(session_id, str(DATABASE_PATH))
 
-    async def get_response(self, prompt: str) -> str:
-        """Get response from the agent."""
+    async def get_response(self, prompt: str, session: Optional[ChatSession] = None) -> str:
+        """Get response from the agent, in ``session`` or the current one."""
         try:
-            result = await Runner.run(self.agent, prompt, session=self.session)
+            result = await Runner.run(self.agent, prompt, session=session or self.session)
             return result.final_output
         except Exception as e:
             return f"Error: {e}"
+
+    async def stream_response(self, prompt: str,
+                              session: Optional[ChatSession] = None) -> AsyncIterator[str]:
+        """Stream the response from the agent as text deltas.
+
+        The agent itself is stateless, so callers serving several
+        conversations at once pass their own ``session``. Closing the
+        iterator before the end cancels the run.
+        """
+        result = events = None
+        try:
+            result = Runner.run_streamed(self.agent, prompt, session=session or self.session)
+            events = result.stream_events()
+            async for event in events:
+                if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                    yield event.data.delta
+        except Exception as e:
+            yield f"\n\nError: {e}"
+        finally:
+            # Closing this generator early, e.g. when an API client goes away,
+            # stops the model instead of letting the run finish unread
+            if result is not None and not result.is_complete:
+                result.cancel()
+            if events is not None:
+                await events.aclose()
@@ -0,0 +1,139 @@
+"""Persistent chat session with compressed message storage."""
+import asyncio
+import zlib
+from contextlib import closing
+from typing import Callable, List, Optional
+
+from agents import SQLiteSession
+from agents.memory.session_settings import resolve_session_limit
+from agents.memory.sqlite_session import _await_mutation
+
+from ..core.database import encode_message, decode_message, extract_display
+
+
+class ChatSession(SQLiteSession):
+    """SQLite session that compresses large message payloads.
+
+    Long tool outputs are the main reason ``conversations.db`` grows, so
+    messages above ``COMPRESSION_THRESHOLD`` are written as zlib BLOBs.
+    Reads accept both plain JSON rows and compressed rows. Each row also
+    gets its display role and text so the UI never has to parse payloads.
+    Writes go through the library's own locking and rollback; only the
+    row format and decoding are replaced. The schema must be current:
+    entry points run ``migrate()`` once at startup.
+    """
+
+    def _insert_items(self, conn, items: List) -> None:
+        """Write ``items`` compressed and with their display columns.
+
+        The library's writers call this inside their lock and roll back
+        the transaction if it fails.
+        """
+        conn.execute(
+            f"INSERT OR IGNORE INTO {self.sessions_table} (session_id) VALUES (?)",
+            (self.session_id,)
+        )
+        rows = []
+        for item in items:
+            # An empty role marks rows with nothing to display
+            role, display_text = extract_display(item) or ("", None)
+            rows.append((self.session_id, encode_message(item), role, display_text))
+        conn.executemany(
+            f"INSERT INTO {self.messages_table} "
+            "(session_id, message_data, role, display_text) VALUES (?, ?, ?, ?)",
+            rows
+        )
+        conn.execute(
+            f"UPDATE {self.sessions_table} SET updated_at = CURRENT_TIMESTAMP "
+            "WHERE session_id = ?",
+            (self.session_id,)
+        )
+
+    @staticmethod
+    def _decode_rows(rows) -> List:
+        """Decode ``(message_data,)`` rows, skipping any that are corrupt."""
+        items = []
+        for (message_data,) in rows:
+            try:
+                items.append(decode_message(message_data))
+            except (ValueError, TypeError, zlib.error):
+                continue
+        return items
+
+    async def get_items(self, limit: Optional[int] = None) -> List:
+        """Retrieve the conversation history, as ``SQLiteSession`` does."""
+        session_limit = resolve_session_limit(limit, self.session_settings)
+
+        def _get_items_sync():
+            with self._locked_connection() as conn:
+                if session_limit is None:
+                    cursor = conn.execute(
+                        f"SELECT message_data FROM {self.messages_table} "
+                        "WHERE session_id = ? ORDER BY id ASC",
+                        (self.session_id,)
+                    )
+                    return self._decode_rows(cursor.fetchall())
+
+                def newest(count: int):
+                    cursor = conn.execute(
+                        f"SELECT message_data FROM {self.messages_table} "
+                        "WHERE session_id = ? ORDER BY id DESC LIMIT ?",
+                        (self.session_id, count)
+                    )
+                    return list(reversed(cursor.fetchall()))
+
+                if session_limit <= 0:
+                    # Keeps SQLite's LIMIT semantics, where negative means unlimited
+                    return self._decode_rows(newest(session_limit))
+
+                # Widen the window past corrupt rows so the limit counts valid items
+                window = session_limit
+                while True:
+                    rows = newest(window)
+                    items = self._decode_rows(rows)
+                    if len(items) >= session_limit:
+                        return items[-session_limit:]
+                    if len(rows) < window:
+                        return items
+                    window *= 2
+
+        return await asyncio.to_thread(_get_items_sync)
+
+    async def _pop_item_with_validation(self, validate: Optional[Callable] = None):
+        """Remove and return the most recent valid item, as ``SQLiteSession`` does.
+
+        ``pop_item`` goes through here; corrupt rows at the tail are dropped.
+        A ``validate`` callback that raises rolls the removal back.
+        """
+
+        def _pop_item_sync():
+            with self._write_connection() as conn:
+                while True:
+                    with closing(conn.execute(
+                        f"""
+                        DELETE FROM {self.messages_table}
+                        WHERE id = (
+                            SELECT id FROM {self.messages_table}
+                            WHERE session_id = ?
+                            ORDER BY id DESC
+                            LIMIT 1
+                        )
+                        RETURNING message_data
+                        """,
+                        (self.session_id,)
+                    )) as cursor:
+                        result = cursor.fetchone()
+
+                    if result is None:
+                        conn.commit()
+                        return None
+                    items = self._decode_rows([result])
+                    if not items:
+                        conn.commit()
+                        continue
+                    if validate is not None:
+                        validate(items[0])
+                    conn.commit()
+                    return items[0]
+
+        return await _await_mutation(asyncio.to_thread(_pop_item_sync))
@@ -1,5 +1,5 @@
 """Core application components."""
-from .config import config
+from .config import config, InferenceProfile
 from .constants import *
 
-__all__ = ["config", "DEFAULT_MODEL", "OLLAMA_BASE_URL", "DATABASE_PATH"]
+__all__ = ["config", "InferenceProfile", "DEFAULT_MODEL", "OLLAMA_BASE_URL", "DATABASE_PATH"]
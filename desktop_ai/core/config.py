@@ -1,57 +1,375 @@
 """Simple configuration management."""
+import atexit
 import json
-from typing import Dict, Any, Optional
-from .constants import CONFIG_FILE, SYSTEM_INSTRUCTIONS
+import os
+import re
+import threading
+from dataclasses import dataclass, fields
+from typing import Dict, Any, Callable, Optional, Tuple, Union
+from .constants import (
+    CONFIG_FILE, SYSTEM_INSTRUCTIONS, CONFIG_SAVE_DELAY,
+    BATCH_CONCURRENCY, MODELS_CACHE_TTL, PREVIEW_CACHE_SIZE
+)
+
+
+@dataclass(frozen=True)
+class Setting:
+    """Type, default and bounds of one configuration key."""
+    type: type
+    default: Any
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    optional: bool = False
+    validator: Optional[Callable[[Any], Any]] = None  # Further checks on the coerced value
+
+    def validate(self, value: Any) -> Any:
+        """Coerce ``value`` to this setting, raising ValueError if it can't be."""
+        if value is None:
+            if self.optional:
+                return None
+            raise ValueError("a value is required")
+        if self.type in (int, float) and isinstance(value, bool):
+            raise ValueError("expected a number")
+        if self.type is str and not isinstance(value, str):
+            raise ValueError("expected a string")
+        if self.type is bool and not isinstance(value, bool):
+            raise ValueError("expected true or false")
+        if self.type is dict and not isinstance(value, dict):
+            raise ValueError("expected an object")
+        value = self.type(value)
+        if self.minimum is not None and value < self.minimum:
+            raise ValueError(f"must be at least {self.minimum}")
+        if self.maximum is not None and value > self.maximum:
+            raise ValueError(f"must be at most {self.maximum}")
+        if self.validator is not None:
+            value = self.validator(value)
+        return value
+
+
+def _check_duration(value: str) -> str:
+    """Accept Ollama keep-alive values: seconds, or durations such as ``10m``."""
+    value = value.strip()
+    if not re.fullmatch(r"-?\d+|-?(\d+(\.\d+)?(ms|s|m|h))+", value):
+        raise ValueError("expected seconds or a duration such as 10m or 1h")
+    return value
+
+
+# Options an inference profile may set; None leaves the model's default
+PROFILE_SCHEMA: Dict[str, Setting] = {
+    "temperature": Setting(float, None, minimum=0, maximum=2, optional=True),
+    "top_p": Setting(float, None, minimum=0, maximum=1, optional=True),
+    "top_k": Setting(int, None, minimum=1, optional=True),
+    "repeat_penalty": Setting(float, None, minimum=0, optional=True),
+    "seed": Setting(int, None, minimum=0, optional=True),
+    "num_predict": Setting(int, None, minimum=1, optional=True),
+    "num_ctx": Setting(int, None, minimum=256, optional=True),
+    "num_thread": Setting(int, None, minimum=1, optional=True),
+    "num_batch": Setting(int, None, minimum=1, optional=True),
+    "keep_alive": Setting(str, None, optional=True, validator=_check_duration),
+}
+
+
+@dataclass(frozen=True)
+class InferenceProfile:
+    """Ollama inference options for one model.
+
+    Unset options keep the model's defaults. ``num_ctx``, ``num_thread`` and
+    ``num_batch`` take effect when Ollama loads the model; ``keep_alive``
+    is how long it stays loaded after a request.
+    """
+    temperature: Optional[float] = None
+    top_p: Optional[float] = None
+    top_k: Optional[int] = None
+    repeat_penalty: Optional[float] = None
+    seed: Optional[int] = None
+    num_predict: Optional[int] = None
+    num_ctx: Optional[int] = None
+    num_thread: Optional[int] = None
+    num_batch: Optional[int] = None
+    keep_alive: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "InferenceProfile":
+        """Validate a profile read from config.json; unknown keys are dropped."""
+        values = {}
+        for key, setting in PROFILE_SCHEMA.items():
+            try:
+                values[key] = setting.validate(data.get(key))
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"{key}: {e}") from None
+        return cls(**values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The options that are set, as stored in config.json."""
+        return {f.name: getattr(self, f.name) for f in fields(self) if getattr(self, f.name) is not None}
+
+    def options(self) -> Dict[str, Any]:
+        """The options that are set, in the form of Ollama's native ``options``."""
+        options = self.to_dict()
+        options.pop("keep_alive", None)
+        return options
+
+    def native_keep_alive(self) -> Union[int, str, None]:
+        """``keep_alive`` as Ollama's API expects it: bare numbers are seconds."""
+        if self.keep_alive is not None and self.keep_alive.lstrip("-").isdigit():
+            return int(self.keep_alive)
+        return self.keep_alive
+
+
+def _check_profiles(value: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Validate every model's profile, keeping only the options that are set."""
+    profiles = {}
+    for model, profile in value.items():
+        if not isinstance(profile, dict):
+            raise ValueError(f"{model}: expected an object")
+        try:
+            profile = InferenceProfile.from_dict(profile).to_dict()
+        except ValueError as e:
+            raise ValueError(f"{model}: {e}") from None
+        if profile:
+            profiles[str(model)] = profile
+    return profiles
+
+
+# Every setting config.json may hold; unknown keys are kept but ignored
+SCHEMA: Dict[str, Setting] = {
+    "model": Setting(str, None, optional=True),
+    "system_prompt": Setting(str, SYSTEM_INSTRUCTIONS),
+    "retention_days": Setting(int, 0, minimum=0),
+    "retention_max_mb": Setting(int, 0, minimum=0),
+    "chat_memory_mb": Setting(int, 32, minimum=0),
+    "batch_concurrency": Setting(int, BATCH_CONCURRENCY, minimum=1, maximum=64),
+    "models_cache_ttl": Setting(int, MODELS_CACHE_TTL, minimum=0),
+    "preview_cache_size": Setting(int, PREVIEW_CACHE_SIZE, minimum=1),
+    "restore_last_session": Setting(bool, True),
+    "model_profiles": Setting(dict, {}, validator=_check_profiles),
+}
 
 
 class Config:
-    """Simple configuration class."""
-    
+    """Simple configuration class.
+
+    Setters only update memory and schedule a save; changes made within
+    ``CONFIG_SAVE_DELAY`` seconds are written together, on a timer thread,
+    to a temporary file that then replaces ``config.json``. Pending changes
+    are flushed at exit. ``reload`` picks up edits made to the file by hand.
+    """
+
     def __init__(self):
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._dirty = False
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._saved: Dict[str, Any] = {}
         self._config = self._load_config()
-    
+        atexit.register(self.flush)
+
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from file."""
-        defaults = {
-            "model": None,
-            "system_prompt": SYSTEM_INSTRUCTIONS
-        }
-        
+        defaults = {key: setting.default for key, setting in SCHEMA.items()}
+        config = dict(defaults)
+        config.update(self._read_file())
+        self._saved = dict(config)
+        return config
+
+    def _read_file(self) -> Dict[str, Any]:
+        """Read and validate config.json; invalid values fall back to defaults."""
         try:
-            if CONFIG_FILE.exists():
-                with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                # Merge with defaults to ensure all keys exist
-                defaults.update(config)
-            return defaults
-        except Exception:
-            return defaults
-    
-    def save(self) -> None:
-        """Save configuration to file."""
+            self._stamp = self._file_stamp()
+            with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        values = {}
+        for key, value in data.items():
+            setting = SCHEMA.get(key)
+            if setting is None:
+                values[key] = value
+                continue
+            try:
+                values[key] = setting.validate(value)
+            except (TypeError, ValueError) as e:
+                print(f"Ignoring config value {key}={value!r}: {e}")
+        return values
+
+    @staticmethod
+    def _file_stamp() -> Optional[Tuple[int, int]]:
         try:
-            with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self._config, f, indent=2, ensure_ascii=False)
-        except Exception:
-            pass  # Silently ignore save errors
-    
+            stat = os.stat(CONFIG_FILE)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _set(self, key: str, value: Any) -> None:
+        """Validate and store a value, then schedule a save if it changed."""
+        value = SCHEMA[key].validate(value)
+        with self._lock:
+            if self._config.get(key) == value:
+                return
+            self._config[key] = value
+        self.save()
+
+    def save(self) -> None:
+        """Schedule a write of the configuration, debounced."""
+        with self._lock:
+            self._dirty = True
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(CONFIG_SAVE_DELAY, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> bool:
+        """Write pending changes now; returns False if the write failed."""
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return True
+                data = dict(self._config)
+                self._dirty = False
+
+            # Setters are not blocked while the file is written
+            tmp_path = f"{CONFIG_FILE}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, CONFIG_FILE)
+            except OSError as e:
+                print(f"Error saving config: {e}")
+                with self._lock:
+                    self._dirty = True
+                return False
+
+            with self._lock:
+                self._saved = data
+                self._stamp = self._file_stamp()
+            return True
+
+    def reload(self) -> Dict[str, Any]:
+        """Apply external edits to config.json and return the keys that changed.
+
+        Only values that differ from what was last read or written count as
+        edits, so unsaved changes made in this process are kept.
+        """
+        with self._lock:
+            if self._file_stamp() == self._stamp:
+                return {}
+            values = self._read_file()
+            changes = {}
+            for key, value in values.items():
+                if value != self._saved.get(key) and value != self._config.get(key):
+                    changes[key] = value
+            self._config.update(changes)
+            self._saved.update(values)
+            return changes
+
     @property
     def model(self) -> Optional[str]:
         return self._config.get('model')
-    
+
     @model.setter
     def model(self, value: str) -> None:
-        self._config['model'] = value
-        self.save()
-    
+        self._set('model', value)
+
     @property
     def system_prompt(self) -> str:
         return self._config.get('system_prompt', SYSTEM_INSTRUCTIONS)
-    
+
     @system_prompt.setter
     def system_prompt(self, value: str) -> None:
-        self._config['system_prompt'] = value
-        self.save()
+        self._set('system_prompt', value)
+
+    @property
+    def retention_days(self) -> int:
+        """Delete conversations older than this many days (0 keeps all)."""
+        return int(self._config.get('retention_days') or 0)
+
+    @retention_days.setter
+    def retention_days(self, value: int) -> None:
+        self._set('retention_days', value)
+
+    @property
+    def retention_max_mb(self) -> int:
+        """Cap on stored message data in megabytes (0 is unlimited)."""
+        return int(self._config.get('retention_max_mb') or 0)
+
+    @retention_max_mb.setter
+    def retention_max_mb(self, value: int) -> None:
+        self._set('retention_max_mb', value)
+
+    @property
+    def chat_memory_mb(self) -> int:
+        """Budget for rendered messages kept by each chat view (0 is unlimited)."""
+        return int(self._config.get('chat_memory_mb') or 0)
+
+    @chat_memory_mb.setter
+    def chat_memory_mb(self, value: int) -> None:
+        self._set('chat_memory_mb', value)
+
+    @property
+    def batch_concurrency(self) -> int:
+        """Prompts the batch runner sends to the model at once."""
+        return int(self._config.get('batch_concurrency') or BATCH_CONCURRENCY)
+
+    @batch_concurrency.setter
+    def batch_concurrency(self, value: int) -> None:
+        self._set('batch_concurrency', value)
+
+    @property
+    def models_cache_ttl(self) -> int:
+        """Seconds before the cached model list is refreshed from Ollama."""
+        return int(self._config.get('models_cache_ttl', MODELS_CACHE_TTL))
+
+    @models_cache_ttl.setter
+    def models_cache_ttl(self, value: int) -> None:
+        self._set('models_cache_ttl', value)
+
+    @property
+    def preview_cache_size(self) -> int:
+        """Session previews kept in memory by the history window."""
+        return int(self._config.get('preview_cache_size') or PREVIEW_CACHE_SIZE)
+
+    @preview_cache_size.setter
+    def preview_cache_size(self, value: int) -> None:
+        self._set('preview_cache_size', value)
+
+    @property
+    def restore_last_session(self) -> bool:
+        """Reopen the last conversation when the main window is first shown."""
+        return bool(self._config.get('restore_last_session', True))
+
+    @restore_last_session.setter
+    def restore_last_session(self, value: bool) -> None:
+        self._set('restore_last_session', value)
+
+    @property
+    def model_profiles(self) -> Dict[str, Dict[str, Any]]:
+        """Inference options per model name, as stored in config.json."""
+        return dict(self._config.get('model_profiles') or {})
+
+    @model_profiles.setter
+    def model_profiles(self, value: Dict[str, Dict[str, Any]]) -> None:
+        self._set('model_profiles', value)
+
+    def get_profile(self, model: Optional[str]) -> InferenceProfile:
+        """The inference profile for ``model``; an empty one if none is saved."""
+        return InferenceProfile(**self.model_profiles.get(model or "", {}))
+
+    def set_profile(self, model: str, profile: InferenceProfile) -> None:
+        """Save the inference profile for ``model``; an empty profile removes it."""
+        profiles = self.model_profiles
+        profiles[model] = profile.to_dict()
+        if not profiles[model]:
+            del profiles[model]
+        self.model_profiles = profiles
 
 
 # Global instance
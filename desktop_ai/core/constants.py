@@ -5,12 +5,42 @@ from pathlib import Path
 OLLAMA_BASE_URL = "http://localhost:11434/v1"
 API_KEY = "sk-fake_api_key"
 SYSTEM_INSTRUCTIONS = "You are a helpful assistant"
+MODEL_CACHE_SIZE = 4  # Model wrappers each agent keeps for quick switching
 
 # Configuration
 CONFIG_DIR = Path.home() / ".config" / "desktop-ai"
 CONFIG_FILE = CONFIG_DIR / "config.json"
 DATABASE_PATH = CONFIG_DIR / "conversations.db"
 LOG_FILE = CONFIG_DIR / "desktop_ai.log"
+CONFIG_SAVE_DELAY = 0.5  # Seconds of quiet before config changes are written
+MODELS_CACHE_FILE = CONFIG_DIR / "models.json"
+MODELS_CACHE_TTL = 10 * 60  # Seconds before the cached model list is refreshed
+
+INSTANCE_SOCKET = str(CONFIG_DIR / "instance.sock")  # Local socket owned by the running instance
+
+# Storage
+COMPRESSION_THRESHOLD = 1024  # Message payloads above this many bytes are compressed
+MAINTENANCE_INTERVAL_MS = 30 * 60 * 1000  # Idle database maintenance period
+
+# Startup
+WARMUP_DELAY_MS = 1500  # Idle time after the tray icon appears before preloading the main window
+INSTANCE_TIMEOUT_MS = 1000  # How long a new launch waits for the running instance to answer
+
+# Headless API
+SERVE_HOST = "127.0.0.1"
+SERVE_PORT = 8765
+MAX_REQUEST_BYTES = 1024 * 1024  # Largest request body the API server accepts
+BATCH_CONCURRENCY = 4  # Prompts the batch runner sends to the model at once
+TUNE_BATCH_SIZES = [128, 256, 512]  # num_batch values the tune command tries by default
+TUNE_PREDICT = 128  # Tokens generated per tune measurement
+
+# Chat view
+HISTORY_PAGE_SIZE = 50  # Messages loaded per page when opening a conversation
+SESSION_PAGE_SIZE = 100  # Sessions fetched per page in the history list
+PREVIEW_PREFETCH_COUNT = 5  # Most recent sessions whose previews are warmed on open
+PREVIEW_CACHE_SIZE = 20  # Session previews kept in memory by the history window
+SNAPSHOT_FILE = CONFIG_DIR / "last_session.json"  # What the chat view showed when last hidden
+SNAPSHOT_MESSAGES = 30  # Most recent messages kept in the snapshot
 
 # Ensure directories exist
 CONFIG_DIR.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,214 @@
+"""SQLite helpers shared by the agent session and the services."""
+import json
+import sqlite3
+import zlib
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional, Tuple, Union
+
+from .constants import DATABASE_PATH, COMPRESSION_THRESHOLD
+
+
+@contextmanager
+def connect(db_path: str = str(DATABASE_PATH)) -> Iterator[sqlite3.Connection]:
+    """Open a connection, commit on success and always close it."""
+    conn = sqlite3.connect(db_path)
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def encode_message(message: Any) -> Union[str, bytes]:
+    """Serialize a message, compressing payloads above the size threshold.
+
+    Small messages are stored as plain JSON text so they stay readable with
+    any SQLite tool; large ones are stored as a zlib-compressed BLOB.
+    """
+    data = json.dumps(message)
+    if len(data) < COMPRESSION_THRESHOLD:
+        return data
+    return zlib.compress(data.encode("utf-8"))
+
+
+def decode_message(data: Union[str, bytes]) -> Any:
+    """Deserialize a stored message, transparently decompressing BLOBs."""
+    if isinstance(data, bytes):
+        data = zlib.decompress(data).decode("utf-8")
+    return json.loads(data)
+
+
+def extract_display(message: Any) -> Optional[Tuple[str, str]]:
+    """Return ``(role, text)`` for chat messages, or None for other items.
+
+    Assistant messages carry a list of output parts; tool calls and tool
+    outputs have no chat role and are not displayed.
+    """
+    if not isinstance(message, dict):
+        return None
+    role = message.get('role')
+    if role not in ('user', 'assistant'):
+        return None
+
+    content = message.get('content', '')
+    if isinstance(content, list):
+        parts = [part['text'] for part in content if isinstance(part, dict) and 'text' in part]
+        text = "\n\n".join(parts) if parts else str(content)
+    else:
+        text = str(content)
+    return role, text
+
+
+def fill_display(conn: sqlite3.Connection, rows) -> int:
+    """Fill in the display columns of ``(id, message_data)`` rows.
+
+    Rows with nothing to display, or that cannot be decoded, get an empty
+    role so they are not picked up again. Returns the number of rows.
+    """
+    updates = []
+    for message_id, message_data in rows:
+        try:
+            display = extract_display(decode_message(message_data))
+        except (ValueError, zlib.error):
+            display = None
+        role, display_text = display or ("", None)
+        updates.append((role, display_text, message_id))
+    conn.executemany("UPDATE agent_messages SET role = ?, display_text = ? WHERE id = ?", updates)
+    return len(updates)
+
+
+def _create_base_schema(conn: sqlite3.Connection) -> None:
+    """Tables created by ``SQLiteSession``, plus the indexes our queries need."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS agent_sessions (
+            session_id TEXT PRIMARY KEY,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS agent_messages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT NOT NULL,
+            message_data TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (session_id) REFERENCES agent_sessions (session_id)
+                ON DELETE CASCADE
+        )
+        """
+    )
+    _create_session_created_index(conn)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_agent_sessions_updated_at "
+        "ON agent_sessions (updated_at)"
+    )
+
+
+def _create_session_created_index(conn: sqlite3.Connection) -> None:
+    """Index messages by session and creation time.
+
+    ``SQLiteSession`` already owns ``idx_agent_messages_session_id`` (on
+    ``session_id, id``), so this index needs a name of its own. The rowid is
+    implicitly the last index column, so it also serves
+    ``ORDER BY created_at, id`` lookups per session.
+    """
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_agent_messages_session_created "
+        "ON agent_messages (session_id, created_at)"
+    )
+
+
+def _add_display_columns(conn: sqlite3.Connection) -> None:
+    """Store the display role and text next to each message.
+
+    New rows get the columns filled in by ``ChatSession`` at write time;
+    existing rows are left NULL here and filled in by
+    ``MaintenanceService.backfill_display`` in small batches.
+    """
+    conn.execute("ALTER TABLE agent_messages ADD COLUMN role TEXT")
+    conn.execute("ALTER TABLE agent_messages ADD COLUMN display_text TEXT")
+
+
+def _index_unfilled_display(conn: sqlite3.Connection) -> None:
+    """Index the rows whose display columns have not been filled in yet.
+
+    Rows leave the index as they are backfilled, so once the backfill is
+    done it is empty and finding the remaining rows costs nothing.
+    """
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_agent_messages_unfilled "
+        "ON agent_messages (id) WHERE role IS NULL"
+    )
+
+
+def _add_message_order_index(conn: sqlite3.Connection) -> None:
+    """Index messages by insertion order for keyset paging of long sessions.
+
+    ``SQLiteSession`` creates this same index, under the same name, when it
+    opens the database; creating it here too keeps a second copy from ever
+    being built.
+    """
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_agent_messages_session_id "
+        "ON agent_messages (session_id, id)"
+    )
+
+
+def _drop_duplicate_order_index(conn: sqlite3.Connection) -> None:
+    """Keep a single ``(session_id, id)`` index.
+
+    Earlier versions of ``_add_message_order_index`` built a copy of the
+    library's index as ``idx_agent_messages_session_order``. Databases whose
+    base schema claimed the library's name for the ``created_at`` index
+    (now ``idx_agent_messages_session_created``) get it rebuilt first.
+    """
+    columns = [row[2] for row in conn.execute("PRAGMA index_info(idx_agent_messages_session_id)")]
+    if columns != ["session_id", "id"]:
+        conn.execute("DROP INDEX IF EXISTS idx_agent_messages_session_id")
+        _add_message_order_index(conn)
+    conn.execute("DROP INDEX IF EXISTS idx_agent_messages_session_order")
+
+
+# Ordered schema migrations; the database's ``user_version`` is the number
+# of entries already applied. Only ever append to this list.
+MIGRATIONS = [
+    _create_base_schema,
+    _add_display_columns,
+    _add_message_order_index,
+    # Databases first created by SQLiteSession skipped this index in
+    # _create_base_schema, where it shared the library's index name
+    _create_session_created_index,
+    _drop_duplicate_order_index,
+    _index_unfilled_display,
+]
+
+
+def migrate(db_path: str = str(DATABASE_PATH)) -> int:
+    """Bring the database schema up to date and return its version.
+
+    Safe to call on every startup: when the recorded version is current this
+    is a single PRAGMA read. Each migration runs in its own transaction
+    together with the version bump, so an interrupted upgrade resumes cleanly.
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                migration(conn)
+                conn.execute(f"PRAGMA user_version = {number}")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            version = number
+        return version
+    finally:
+        conn.close()
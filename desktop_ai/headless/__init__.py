@@ -0,0 +1,6 @@
+"""Headless API server, batch runner and tuning."""
+from .server import ApiServer, serve
+from .batch import BatchRunner, run_batch
+from .tune import run_tune
+
+__all__ = ["ApiServer", "serve", "BatchRunner", "run_batch", "run_tune"]
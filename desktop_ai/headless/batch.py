@@ -0,0 +1,190 @@
+"""Run a file of prompts through the model without the GUI."""
+import asyncio
+import json
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, TextIO
+
+from agents import Runner
+
+from ..agent import ChatAgent
+from ..core import config, OLLAMA_BASE_URL
+
+
+@dataclass
+class BatchItem:
+    """One prompt read from the input file."""
+    index: int
+    id: str
+    prompt: str
+
+
+@dataclass
+class BatchStats:
+    """Totals for a batch run."""
+    completed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    elapsed: float = 0.0
+
+    def summary(self) -> str:
+        seconds = max(self.elapsed, 1e-9)
+        return (
+            f"{self.completed} completed, {self.failed} failed, {self.skipped} skipped "
+            f"in {self.elapsed:.1f}s: {self.completed / seconds:.2f} prompts/s, "
+            f"{self.output_tokens / seconds:.1f} output tokens/s, "
+            f"{(self.input_tokens + self.output_tokens) / seconds:.1f} total tokens/s"
+        )
+
+
+class BatchRunner:
+    """Runs independent prompts with bounded concurrency.
+
+    Each prompt is a fresh conversation with the configured model and system
+    prompt. Results are written one JSON line each, flushed as they are
+    written, either in input order or as they complete. With ``resume`` the
+    ids already answered in the output file are skipped, so an interrupted
+    run picks up where it stopped; failed prompts are retried.
+    """
+
+    def __init__(self, agent: ChatAgent, concurrency: int, ordered: bool = True):
+        self.agent = agent
+        self.concurrency = max(1, concurrency)
+        self.ordered = ordered
+        self.stats = BatchStats()
+
+    @staticmethod
+    def read_items(stream: TextIO) -> List[BatchItem]:
+        """Parse input lines: ``{"id": ..., "prompt": ...}`` objects or bare strings."""
+        items = []
+        for number, line in enumerate(stream):
+            line = line.strip()
+            if not line:
+                continue
+            data = json.loads(line)
+            if isinstance(data, str):
+                data = {"prompt": data}
+            if not isinstance(data, dict) or not isinstance(data.get("prompt"), str):
+                raise ValueError(f"Line {number + 1}: expected a string or an object with a 'prompt'")
+            item_id = data.get("id", number)
+            items.append(BatchItem(index=len(items), id=str(item_id), prompt=data["prompt"]))
+        return items
+
+    @staticmethod
+    def read_done(lines: Iterable[str]) -> Set[str]:
+        """Ids answered without error in an existing output file."""
+        done = set()
+        for line in lines:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue  # A line cut short by an interruption
+            if isinstance(result, dict) and "id" in result and not result.get("error"):
+                done.add(str(result["id"]))
+        return done
+
+    async def run(self, items: List[BatchItem], output: TextIO,
+                  done: Optional[Set[str]] = None) -> BatchStats:
+        """Answer ``items`` and write results to ``output``."""
+        done = done or set()
+        pending = [item for item in items if item.id not in done]
+        self.stats = BatchStats(skipped=len(items) - len(pending))
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in pending:
+            queue.put_nowait(item)
+
+        # Results that finished ahead of an earlier prompt, in input order mode
+        waiting: Dict[int, dict] = {}
+        order = [item.index for item in pending]
+        position = 0
+
+        def write(result: dict):
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+            output.flush()
+
+        async def worker():
+            nonlocal position
+            while True:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                result = await self._answer(item)
+                if not self.ordered:
+                    write(result)
+                    continue
+                waiting[item.index] = result
+                while position < len(order) and order[position] in waiting:
+                    write(waiting.pop(order[position]))
+                    position += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(pending)))))
+        self.stats.elapsed = time.perf_counter() - start
+        return self.stats
+
+    async def _answer(self, item: BatchItem) -> dict:
+        """Run one prompt and describe the outcome."""
+        start = time.perf_counter()
+        result = {"id": item.id, "index": item.index}
+        try:
+            run = await Runner.run(self.agent.agent, item.prompt)
+            usage = run.context_wrapper.usage
+            result.update(
+                response=str(run.final_output),
+                input_tokens=usage.input_tokens,
+                output_tokens=usage.output_tokens
+            )
+            self.stats.completed += 1
+            self.stats.input_tokens += usage.input_tokens
+            self.stats.output_tokens += usage.output_tokens
+        except Exception as e:
+            result["error"] = str(e)
+            self.stats.failed += 1
+        result["elapsed"] = round(time.perf_counter() - start, 3)
+        return result
+
+
+def run_batch(input_path: str, output_path: str, concurrency: int,
+              ordered: bool = True, resume: bool = False,
+              model: Optional[str] = None, base_url: str = OLLAMA_BASE_URL) -> int:
+    """Run a prompt file and print throughput; returns an exit code."""
+    from ..core.database import migrate
+
+    if not model and not config.model:
+        print("No model configured; pass --model.", file=sys.stderr)
+        return 1
+
+    try:
+        with open(input_path, 'r', encoding='utf-8') as f:
+            items = BatchRunner.read_items(f)
+    except (OSError, ValueError) as e:
+        print(f"Error reading {input_path}: {e}", file=sys.stderr)
+        return 2
+
+    done: Set[str] = set()
+    partial_line = False
+    if resume:
+        try:
+            with open(output_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            done = BatchRunner.read_done(content.splitlines())
+            partial_line = bool(content) and not content.endswith("\n")
+        except FileNotFoundError:
+            pass
+
+    migrate()
+    runner = BatchRunner(ChatAgent(base_url=base_url, model=model), concurrency, ordered)
+    with open(output_path, 'a' if resume else 'w', encoding='utf-8') as output:
+        if partial_line:
+            output.write("\n")
+        try:
+            stats = asyncio.run(runner.run(items, output, done))
+        except KeyboardInterrupt:
+            print("Interrupted; rerun with --resume to continue.", file=sys.stderr)
+            return 130
+    print(stats.summary(), file=sys.stderr)
+    return 1 if stats.failed else 0
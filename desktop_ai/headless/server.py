@@ -0,0 +1,355 @@
+"""Local HTTP API for driving the assistant without the GUI."""
+import asyncio
+import inspect
+import json
+import re
+import sqlite3
+import uuid
+import weakref
+from dataclasses import dataclass, field, asdict
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit, parse_qsl, unquote
+
+from ..agent import ChatAgent, ChatSession
+from ..core import config, DATABASE_PATH, MAX_REQUEST_BYTES
+from ..services import OllamaService, SessionService, SessionInfo, MaintenanceService
+
+STATUS_TEXT = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 500: "Internal Server Error"
+}
+
+
+class HttpError(Exception):
+    """An error answered with ``status`` and a JSON ``{"error": message}`` body."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class Request:
+    """A parsed HTTP request."""
+    method: str
+    path: str
+    query: Dict[str, str] = field(default_factory=dict)
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+    def json(self) -> Dict[str, Any]:
+        """The body as a JSON object; an empty body is an empty object."""
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body.decode('utf-8'))
+        except ValueError:
+            raise HttpError(400, "Body is not valid JSON")
+        if not isinstance(data, dict):
+            raise HttpError(400, "Body must be a JSON object")
+        return data
+
+    def int_param(self, name: str, default: Optional[int] = None) -> Optional[int]:
+        """An integer query parameter."""
+        value = self.query.get(name)
+        if value is None:
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            raise HttpError(400, f"'{name}' must be an integer")
+
+    @property
+    def keep_alive(self) -> bool:
+        return self.headers.get('connection', '').lower() != 'close'
+
+
+class ApiServer:
+    """Serves chat, session and history operations over HTTP.
+
+    Every client is handled on one asyncio loop. All conversations share one
+    ``ChatAgent``; each request runs in its own ``ChatSession``, and requests
+    for the same session are serialized so their turns never interleave.
+    Database reads run on worker threads.
+
+    Chat replies stream as newline-delimited JSON over a chunked response:
+    ``{"session_id": ...}``, then ``{"delta": ...}`` per chunk, then
+    ``{"done": true}``.
+    """
+
+    def __init__(self, agent: Optional[ChatAgent] = None,
+                 session_service: Optional[SessionService] = None):
+        self.agent = agent or ChatAgent()
+        self.session_service = session_service or SessionService()
+        # Locks live as long as a request holds or waits on them
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+        self._routes = [
+            ("GET", r"/health", self._health),
+            ("GET", r"/models", self._models),
+            ("GET", r"/sessions", self._list_sessions),
+            ("POST", r"/sessions", self._create_session),
+            ("GET", r"/sessions/(?P<session_id>[^/]+)/messages", self._session_messages),
+            ("POST", r"/sessions/(?P<session_id>[^/]+)/chat", self._chat),
+            ("DELETE", r"/sessions/(?P<session_id>[^/]+)", self._delete_session),
+            ("POST", r"/chat", self._chat),
+        ]
+        self._routes = [(method, re.compile(pattern + "$"), handler)
+                        for method, pattern, handler in self._routes]
+
+    async def start(self, host: str, port: int,
+                    socket_path: Optional[str] = None) -> asyncio.AbstractServer:
+        """Listen on ``socket_path`` if given, else on ``host:port``."""
+        if socket_path:
+            return await asyncio.start_unix_server(
+                self._handle_client, path=socket_path, limit=MAX_REQUEST_BYTES
+            )
+        return await asyncio.start_server(
+            self._handle_client, host, port, limit=MAX_REQUEST_BYTES
+        )
+
+    def session_lock(self, session_id: str) -> asyncio.Lock:
+        """The lock serializing requests for ``session_id``."""
+        lock = self._locks.get(session_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[session_id] = lock
+        return lock
+
+    # Connection handling
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection until the client closes it."""
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HttpError as e:
+                    await self._send_json(writer, e.status, {"error": str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                await self._dispatch(request, writer)
+                if not request.keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Request]:
+        """Read one request, or None when the client is done."""
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            raise HttpError(413, "Request headers too large")
+
+        lines = head.decode('latin-1').split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "Malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HttpError(400, "Invalid Content-Length")
+        if length > MAX_REQUEST_BYTES:
+            raise HttpError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b""
+
+        url = urlsplit(target)
+        return Request(
+            method=method.upper(),
+            path=unquote(url.path).rstrip("/") or "/",
+            query=dict(parse_qsl(url.query)),
+            headers=headers,
+            body=body
+        )
+
+    async def _dispatch(self, request: Request, writer: asyncio.StreamWriter):
+        """Route a request and write its response."""
+        try:
+            handler, params = self._match(request)
+            result = handler(request, **params)
+            if inspect.isasyncgen(result):
+                await self._send_stream(writer, result, request.keep_alive)
+                return
+            await self._send_json(writer, 200, await result, request.keep_alive)
+        except HttpError as e:
+            await self._send_json(writer, e.status, {"error": str(e)}, request.keep_alive)
+        except ConnectionError:
+            raise
+        except Exception as e:
+            print(f"Error handling {request.method} {request.path}: {e}")
+            await self._send_json(writer, 500, {"error": str(e)}, request.keep_alive)
+
+    def _match(self, request: Request):
+        """Find the handler for a request and its path parameters."""
+        allowed = False
+        for method, pattern, handler in self._routes:
+            match = pattern.match(request.path)
+            if match:
+                if method == request.method:
+                    return handler, match.groupdict()
+                allowed = True
+        if allowed:
+            raise HttpError(405, f"{request.method} not allowed on {request.path}")
+        raise HttpError(404, f"No route for {request.path}")
+
+    @staticmethod
+    async def _send_json(writer: asyncio.StreamWriter, status: int, data, keep_alive: bool):
+        """Write a complete JSON response."""
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    @staticmethod
+    async def _send_stream(writer: asyncio.StreamWriter, events: AsyncIterator[Dict], keep_alive: bool):
+        """Write events as newline-delimited JSON in a chunked response."""
+        head = (
+            "HTTP/1.1 200 OK\r\n"
+            "Content-Type: application/x-ndjson\r\n"
+            "Transfer-Encoding: chunked\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1'))
+        try:
+            async for event in events:
+                line = json.dumps(event, ensure_ascii=False).encode('utf-8') + b"\n"
+                writer.write(b"%x\r\n%s\r\n" % (len(line), line))
+                await writer.drain()
+        except ConnectionError:
+            raise
+        except Exception as e:
+            # Headers are already sent, so report the failure in the stream
+            line = json.dumps({"error": str(e)}).encode('utf-8') + b"\n"
+            writer.write(b"%x\r\n%s\r\n" % (len(line), line))
+        finally:
+            # Stop the run and release the session if the client went away
+            await events.aclose()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    # Handlers
+
+    async def _health(self, request: Request):
+        return {"status": "ok", "model": config.model}
+
+    async def _models(self, request: Request):
+        models = await asyncio.to_thread(OllamaService.get_models)
+        return {"models": models, "current": config.model}
+
+    async def _list_sessions(self, request: Request):
+        """Sessions, newest first; pass the last one's id and updated_at to page."""
+        limit = request.int_param("limit", 50)
+        after = None
+        if request.query.get("after_id") and request.query.get("after_updated_at"):
+            after = SessionInfo(
+                session_id=request.query["after_id"],
+                created_at="",
+                updated_at=request.query["after_updated_at"]
+            )
+        sessions = await asyncio.to_thread(self.session_service.get_sessions, limit, after)
+        return {"sessions": [asdict(session) for session in sessions]}
+
+    async def _create_session(self, request: Request):
+        return {"session_id": str(uuid.uuid4())}
+
+    async def _session_messages(self, request: Request, session_id: str):
+        messages = await asyncio.to_thread(
+            self.session_service.get_display_messages, session_id,
+            limit=request.int_param("limit"), before_id=request.int_param("before_id")
+        )
+        return {"session_id": session_id, "messages": [asdict(message) for message in messages]}
+
+    async def _delete_session(self, request: Request, session_id: str):
+        async with self.session_lock(session_id):
+            deleted = await asyncio.to_thread(self.session_service.delete_session, session_id)
+        if not deleted:
+            raise HttpError(404, f"No session {session_id}")
+        return {"deleted": session_id}
+
+    def _chat(self, request: Request, session_id: Optional[str] = None):
+        """Send a prompt; streams unless the body sets ``"stream": false``."""
+        data = request.json()
+        prompt = data.get("prompt")
+        if not isinstance(prompt, str) or not prompt.strip():
+            raise HttpError(400, "'prompt' is required")
+        session_id = session_id or data.get("session_id") or str(uuid.uuid4())
+        if data.get("stream", True):
+            return self._stream_chat(session_id, prompt)
+        return self._complete_chat(session_id, prompt)
+
+    async def _complete_chat(self, session_id: str, prompt: str):
+        async with self.session_lock(session_id):
+            session = await asyncio.to_thread(ChatSession, session_id, str(DATABASE_PATH))
+            try:
+                response = await self.agent.get_response(prompt, session=session)
+            finally:
+                session.close()
+        return {"session_id": session_id, "response": response}
+
+    async def _stream_chat(self, session_id: str, prompt: str):
+        async with self.session_lock(session_id):
+            yield {"session_id": session_id}
+            session = await asyncio.to_thread(ChatSession, session_id, str(DATABASE_PATH))
+            deltas = self.agent.stream_response(prompt, session=session)
+            try:
+                async for delta in deltas:
+                    yield {"delta": delta}
+            finally:
+                # Cancels the run when the stream is closed early
+                await deltas.aclose()
+                session.close()
+        yield {"done": True}
+
+
+def serve(host: str, port: int, socket_path: Optional[str] = None) -> int:
+    """Run the API server until interrupted; returns an exit code."""
+    from ..core.database import migrate
+
+    migrate()
+    if not config.model:
+        models = OllamaService.get_models()
+        if not models:
+            print("No Ollama models were found. Please install a model to continue.")
+            return 1
+        config.model = models[0]
+
+    async def backfill():
+        try:
+            await asyncio.to_thread(MaintenanceService().backfill_display)
+        except sqlite3.Error as e:
+            print(f"Error backfilling display text: {e}")
+
+    async def run():
+        # Messages from before display text was stored are filled in meanwhile
+        backfill_task = asyncio.create_task(backfill())
+        server = await ApiServer().start(host, port, socket_path)
+        print(f"Serving Desktop AI on {socket_path or f'http://{host}:{port}'}")
+        async with server:
+            await server.serve_forever()
+        await backfill_task
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
@@ -0,0 +1,90 @@
+"""Measure how thread and batch settings affect a model's speed."""
+import os
+import sys
+from dataclasses import dataclass, replace
+from typing import List, Optional
+
+from ..core import config, TUNE_BATCH_SIZES, TUNE_PREDICT
+from ..services import OllamaService, GenerationStats
+
+TUNE_PROMPT = (
+    "Explain in detail how a CPU executes a program, from fetching instructions "
+    "to writing results back to memory, covering pipelining and caches."
+)
+
+
+@dataclass
+class TuneResult:
+    """The speed measured for one combination of settings."""
+    num_thread: int
+    num_batch: int
+    stats: Optional[GenerationStats] = None
+    error: str = ""
+
+
+def default_threads() -> List[int]:
+    """A quarter, half and all of this machine's logical CPUs."""
+    cpus = os.cpu_count() or 1
+    return sorted({max(1, cpus // 4), max(1, cpus // 2), cpus})
+
+
+def run_tune(model: Optional[str] = None, threads: Optional[List[int]] = None,
+             batches: Optional[List[int]] = None, num_predict: int = TUNE_PREDICT,
+             repeat: int = 1, save: bool = False) -> int:
+    """Try each thread and batch combination, print tokens/s; returns an exit code.
+
+    Requests go through Ollama's native API so ``num_thread`` and
+    ``num_batch`` are honoured. The model's saved profile is the starting
+    point; sampling is made deterministic so runs generate comparable text.
+    Each combination reloads the model, which is reported but not timed.
+    With ``save`` the fastest combination is stored in the model's profile.
+    """
+    model = model or config.model
+    if not model:
+        print("No model configured; pass --model.", file=sys.stderr)
+        return 1
+
+    profile = config.get_profile(model)
+    threads = threads or default_threads()
+    batches = batches or TUNE_BATCH_SIZES
+    print(f"{model}: {len(threads) * len(batches)} combinations, "
+          f"{num_predict} tokens each, {os.cpu_count()} CPUs")
+    print(f"{'threads':>7} {'batch':>6} {'load s':>7} {'prompt tok/s':>13} {'gen tok/s':>10}")
+
+    results = []
+    try:
+        for num_thread in threads:
+            for num_batch in batches:
+                result = TuneResult(num_thread, num_batch)
+                options = dict(profile.options(), num_thread=num_thread, num_batch=num_batch,
+                               num_predict=num_predict, temperature=0, seed=0)
+                try:
+                    runs = [
+                        OllamaService.generate(model, TUNE_PROMPT, options, profile.native_keep_alive())
+                        for _ in range(max(1, repeat))
+                    ]
+                    # The first run includes the reload; later ones reuse the loaded model
+                    result.stats = max(runs, key=lambda stats: stats.eval_rate)
+                    result.stats.load_seconds = runs[0].load_seconds
+                    print(f"{num_thread:>7} {num_batch:>6} {result.stats.load_seconds:>7.1f} "
+                          f"{result.stats.prompt_rate:>13.1f} {result.stats.eval_rate:>10.1f}")
+                except Exception as e:
+                    result.error = str(e)
+                    print(f"{num_thread:>7} {num_batch:>6} failed: {e}")
+                results.append(result)
+    except KeyboardInterrupt:
+        print("Interrupted.", file=sys.stderr)
+        return 130
+
+    measured = [result for result in results if result.stats is not None]
+    if not measured:
+        return 1
+    best = max(measured, key=lambda result: result.stats.eval_rate)
+    print(f"Fastest: num_thread={best.num_thread} num_batch={best.num_batch} "
+          f"({best.stats.eval_rate:.1f} tokens/s)")
+    if save:
+        config.set_profile(model, replace(profile, num_thread=best.num_thread, num_batch=best.num_batch))
+        if not config.flush():
+            return 1
+        print(f"Saved to the {model} profile.")
+    return 0
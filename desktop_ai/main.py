@@ -1,28 +1,99 @@
+import argparse
 import sys
-from PyQt6.QtWidgets import QApplication, QMessageBox
-from .ui import DesktopAI
-from .services import OllamaService
-from .core import config
+from .core import (
+    config, INSTANCE_SOCKET, INSTANCE_TIMEOUT_MS, SERVE_HOST, SERVE_PORT, OLLAMA_BASE_URL,
+    TUNE_BATCH_SIZES, TUNE_PREDICT
+)
+from .utils import SingleInstance
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(prog="desktop-ai", description="Desktop AI chat assistant")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("show", help="show the chat window")
+    ask = commands.add_parser("ask", help="send a prompt to the chat window")
+    ask.add_argument("prompt", nargs="+", help="text to send")
+    quick = commands.add_parser("quick", help="open the quick-ask popup")
+    quick.add_argument("prompt", nargs="*", help="question to ask right away")
+    serve = commands.add_parser("serve", help="run the local API server without the GUI")
+    serve.add_argument("--host", default=SERVE_HOST, help=f"address to bind (default {SERVE_HOST})")
+    serve.add_argument("--port", type=int, default=SERVE_PORT, help=f"port to bind (default {SERVE_PORT})")
+    serve.add_argument("--socket", help="listen on this Unix socket instead of TCP")
+    batch = commands.add_parser("batch", help="answer a JSONL file of prompts")
+    batch.add_argument("input", help="JSONL file of prompts or {\"id\", \"prompt\"} objects")
+    batch.add_argument("-o", "--output", required=True, help="JSONL file for the results")
+    batch.add_argument("-c", "--concurrency", type=int, default=config.batch_concurrency,
+                       help=f"prompts in flight at once (default {config.batch_concurrency})")
+    batch.add_argument("--order", choices=["input", "completion"], default="input",
+                       help="write results in input order or as they finish")
+    batch.add_argument("--resume", action="store_true",
+                       help="skip prompts already answered in the output file")
+    batch.add_argument("--model", help="model to use instead of the configured one")
+    batch.add_argument("--base-url", default=OLLAMA_BASE_URL, help="OpenAI-compatible API endpoint")
+    commands.add_parser("vacuum", help="rebuild conversations.db to reclaim space (close the app first)")
+    tune = commands.add_parser("tune", help="measure tokens/s across thread and batch settings")
+    tune.add_argument("--model", help="model to measure instead of the configured one")
+    tune.add_argument("--threads", type=int, nargs="+", help="num_thread values (default: 1/4, 1/2 and all CPUs)")
+    tune.add_argument("--batch", type=int, nargs="+", help=f"num_batch values (default {TUNE_BATCH_SIZES})")
+    tune.add_argument("--tokens", type=int, default=TUNE_PREDICT,
+                      help=f"tokens to generate per run (default {TUNE_PREDICT})")
+    tune.add_argument("--repeat", type=int, default=1, help="runs per combination; the fastest counts")
+    tune.add_argument("--save", action="store_true", help="store the fastest settings in the model's profile")
+    return parser.parse_args(argv)
 
 
 def main():
     """Main entry point with error handling."""
-    app = QApplication(sys.argv)
+    args = parse_args()
+    if args.command == "serve":
+        from .headless import serve
+        sys.exit(serve(args.host, args.port, args.socket))
+    if args.command == "batch":
+        from .headless import run_batch
+        sys.exit(run_batch(
+            args.input, args.output, args.concurrency, ordered=args.order == "input",
+            resume=args.resume, model=args.model, base_url=args.base_url
+        ))
+    if args.command == "vacuum":
+        from .services import MaintenanceService
+        from .core.database import migrate
+        migrate()
+        sys.exit(0 if MaintenanceService().vacuum() else 1)
+    if args.command == "tune":
+        from .headless import run_tune
+        sys.exit(run_tune(
+            args.model, args.threads, args.batch, num_predict=args.tokens,
+            repeat=args.repeat, save=args.save
+        ))
+
+    command = [args.command] if args.command else []
+    if args.command in ("ask", "quick") and args.prompt:
+        command.append(" ".join(args.prompt))
+
+    # Hand the command to the running instance, if there is one
+    if SingleInstance.send_command(INSTANCE_SOCKET, command or ["show"], INSTANCE_TIMEOUT_MS):
+        return
+
+    from PyQt6.QtWidgets import QApplication, QMessageBox
+    from .ui import DesktopAI
+    from .services import OllamaService
+    from .core.database import migrate
+
+    app = QApplication(sys.argv[:1])
 
     try:
-        models = OllamaService.get_models()
-        if not models:
-            QMessageBox.critical(
-                None,
-                "No Ollama Models Found",
-                "No Ollama models were found. Please install a model to continue.",
-            )
-            sys.exit(1)
+        migrate()
 
+        # Pick a model from the cache; the main window refreshes the list
+        # from Ollama in the background
         if not config.model:
-            config.model = models[0]
+            models = OllamaService.get_cached_model_names()
+            if models:
+                config.model = models[0]
 
         desktop_ai = DesktopAI(app)
+        desktop_ai.handle_command(command)
         desktop_ai.run()
     except Exception:
         QMessageBox.critical(
@@ -34,4 +105,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,5 +1,6 @@
 """Services module."""
-from .ollama_service import OllamaService
-from .session_service import SessionService, SessionInfo
+from .ollama_service import OllamaService, ModelInfo, GenerationStats
+from .session_service import SessionService, SessionInfo, DisplayMessage, SessionSnapshot
+from .maintenance_service import MaintenanceService
 
-__all__ = ["OllamaService", "SessionService", "SessionInfo"]
+__all__ = ["OllamaService", "ModelInfo", "GenerationStats", "SessionService", "SessionInfo", "DisplayMessage", "SessionSnapshot", "MaintenanceService"]
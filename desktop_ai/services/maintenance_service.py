@@ -0,0 +1,147 @@
+"""Database maintenance: compression, retention and compaction."""
+import sqlite3
+from typing import Dict, List
+
+from ..core import DATABASE_PATH, COMPRESSION_THRESHOLD
+from ..core.database import connect, encode_message, decode_message, fill_display
+from .session_service import SessionService
+
+
+class MaintenanceService:
+    """Keeps ``conversations.db`` small and fast.
+
+    Every step is bounded so it can run from an idle timer without holding
+    the database for long.
+    """
+
+    def __init__(self):
+        self.db_path = str(DATABASE_PATH)
+        self._compress_after_id = 0  # Where the next compression batch starts
+
+    def run(self, retention_days: int = 0, retention_max_mb: int = 0) -> Dict[str, int]:
+        """Run all maintenance steps and return what was done."""
+        stats = {"backfilled": 0, "compressed": 0, "deleted_sessions": 0}
+        try:
+            stats["backfilled"] = self.backfill_display()
+            stats["compressed"] = self.compress_existing()
+            stats["deleted_sessions"] = self.apply_retention(retention_days, retention_max_mb)
+            self.compact()
+        except sqlite3.Error as e:
+            print(f"Error running database maintenance: {e}")
+        return stats
+
+    def backfill_display(self, batch_size: int = 500) -> int:
+        """Fill in the display columns of messages stored before they existed.
+
+        Rows are handled in id order, one short transaction per batch, so
+        chats can keep writing meanwhile. Returns the number of rows filled
+        in.
+        """
+        filled = 0
+        last_id = 0
+        while True:
+            with connect(self.db_path) as conn:
+                rows = conn.execute(
+                    "SELECT id, message_data FROM agent_messages "
+                    "WHERE role IS NULL AND id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size)
+                ).fetchall()
+                if not rows:
+                    return filled
+                filled += fill_display(conn, rows)
+            last_id = rows[-1][0]
+
+    def compress_existing(self, batch_size: int = 500) -> int:
+        """Compress large plain-text messages written before compression existed.
+
+        Each call scans the next ``batch_size`` candidates after the last one
+        seen, so rows that cannot be decoded are passed over instead of being
+        selected again; the scan starts over once it reaches the end.
+        """
+        with connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT id, message_data FROM agent_messages "
+                "WHERE id > ? AND typeof(message_data) = 'text' AND length(message_data) >= ? "
+                "ORDER BY id LIMIT ?",
+                (self._compress_after_id, COMPRESSION_THRESHOLD, batch_size)
+            ).fetchall()
+            self._compress_after_id = rows[-1][0] if rows else 0
+
+            updates = []
+            for message_id, message_data in rows:
+                try:
+                    updates.append((encode_message(decode_message(message_data)), message_id))
+                except ValueError:
+                    continue
+            conn.executemany("UPDATE agent_messages SET message_data = ? WHERE id = ?", updates)
+            return len(updates)
+
+    def apply_retention(self, max_age_days: int = 0, max_size_mb: int = 0) -> int:
+        """Delete conversations older than ``max_age_days`` or beyond ``max_size_mb``.
+
+        The size budget keeps the most recently updated conversations and
+        drops the oldest ones once the budget is exhausted.
+        """
+        if max_age_days <= 0 and max_size_mb <= 0:
+            return 0
+
+        with connect(self.db_path) as conn:
+            expired: List[str] = []
+
+            if max_age_days > 0:
+                expired.extend(row[0] for row in conn.execute(
+                    "SELECT session_id FROM agent_sessions WHERE updated_at < datetime('now', ?)",
+                    (f"-{int(max_age_days)} days",)
+                ))
+
+            if max_size_mb > 0:
+                budget = max_size_mb * 1024 * 1024
+                used = 0
+                rows = conn.execute(
+                    """
+                    SELECT s.session_id, COALESCE(SUM(length(m.message_data)), 0)
+                    FROM agent_sessions s
+                    LEFT JOIN agent_messages m ON s.session_id = m.session_id
+                    GROUP BY s.session_id
+                    ORDER BY s.updated_at DESC
+                    """
+                )
+                for session_id, size in rows:
+                    used += size
+                    if used > budget:
+                        expired.append(session_id)
+
+            return SessionService._delete_sessions(conn, list(set(expired)), None)
+
+    def compact(self) -> None:
+        """Release free pages and refresh query planner statistics.
+
+        Only databases already in incremental auto-vacuum mode give pages
+        back here; switching a database over takes a full ``vacuum``, which
+        holds the write lock throughout and so is never run in the background.
+        """
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            # Each result row is one freed page; stepping through them all does the work
+            conn.execute("PRAGMA incremental_vacuum").fetchall()
+            conn.execute("ANALYZE")
+        finally:
+            conn.close()
+
+    def vacuum(self) -> bool:
+        """Rebuild the database, switching it to incremental auto-vacuum.
+
+        Meant for ``desktop-ai vacuum`` while the application is closed; the
+        rebuild blocks every other writer until it finishes.
+        """
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+            conn.execute("ANALYZE")
+            return True
+        except sqlite3.Error as e:
+            print(f"Error vacuuming database: {e}")
+            return False
+        finally:
+            conn.close()
@@ -1,32 +1,150 @@
 """Simplified Ollama service."""
-import ollama
+import json
 import logging
-from typing import List
+import os
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ..core import config, MODELS_CACHE_FILE
+
+
+@dataclass
+class ModelInfo:
+    """An installed Ollama model."""
+    name: str
+    size: int = 0
+    modified_at: str = ""
+    parameter_size: str = ""
+    quantization: str = ""
+
+
+@dataclass
+class GenerationStats:
+    """Token counts and timings Ollama reports for one completion."""
+    prompt_tokens: int = 0
+    prompt_seconds: float = 0.0
+    eval_tokens: int = 0
+    eval_seconds: float = 0.0
+    load_seconds: float = 0.0
+
+    @property
+    def prompt_rate(self) -> float:
+        """Prompt tokens processed per second."""
+        return self.prompt_tokens / self.prompt_seconds if self.prompt_seconds else 0.0
+
+    @property
+    def eval_rate(self) -> float:
+        """Tokens generated per second."""
+        return self.eval_tokens / self.eval_seconds if self.eval_seconds else 0.0
 
 
 class OllamaService:
-    """Service for Ollama model management."""
+    """Service for Ollama model management.
+
+    The model list is cached on disk so the UI can show it without waiting
+    for Ollama; ``fetch_models`` refreshes the cache and is meant to run in
+    the background.
+    """
+
+    @staticmethod
+    def fetch_models() -> List[ModelInfo]:
+        """Query Ollama for installed models and update the cache.
+
+        Raises if Ollama cannot be reached, so callers can tell a failed
+        refresh from an empty model list.
+        """
+        import ollama  # Deferred: the client library is slow to import
+        response = ollama.list()
+        models = []
+        for model_info in getattr(response, 'models', None) or []:
+            details = getattr(model_info, 'details', None)
+            modified_at = getattr(model_info, 'modified_at', None)
+            models.append(ModelInfo(
+                name=model_info.model,
+                size=getattr(model_info, 'size', None) or 0,
+                modified_at=modified_at.isoformat() if modified_at else "",
+                parameter_size=getattr(details, 'parameter_size', None) or "",
+                quantization=getattr(details, 'quantization_level', None) or ""
+            ))
+        models.sort(key=lambda model: model.name)
+        OllamaService._write_cache(models)
+        return models
+
+    @staticmethod
+    def get_cached_models() -> Tuple[List[ModelInfo], Optional[float]]:
+        """Get the cached model list and when it was fetched (epoch seconds)."""
+        try:
+            with open(MODELS_CACHE_FILE, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            models = [ModelInfo(**entry) for entry in data.get('models', [])]
+            return models, data.get('fetched_at')
+        except (OSError, ValueError, TypeError):
+            return [], None
+
+    @staticmethod
+    def cache_is_fresh(ttl: Optional[float] = None) -> bool:
+        """Whether the cached model list is recent enough to skip a refresh."""
+        if ttl is None:
+            ttl = config.models_cache_ttl
+        _, fetched_at = OllamaService.get_cached_models()
+        return fetched_at is not None and time.time() - fetched_at < ttl
+
+    @staticmethod
+    def get_cached_model_names() -> List[str]:
+        """Names of the cached models, without contacting Ollama."""
+        models, _ = OllamaService.get_cached_models()
+        return [model.name for model in models]
 
     @staticmethod
     def get_models() -> List[str]:
-        """Get available models."""
+        """Get available models, from the cache while it is fresh."""
+        if OllamaService.cache_is_fresh():
+            return OllamaService.get_cached_model_names()
         try:
-            response = ollama.list()
-            models = []
-            if hasattr(response, 'models') and response.models:
-                for model_info in response.models:
-                    models.append(model_info.model)
-            return sorted(models)
+            return [model.name for model in OllamaService.fetch_models()]
         except Exception as e:
             logging.error(f"Error getting Ollama models: {e}")
-            return []
+            return OllamaService.get_cached_model_names()
+
+    @staticmethod
+    def generate(model: str, prompt: str, options: Optional[Dict[str, Any]] = None,
+                 keep_alive: Union[int, str, None] = None) -> GenerationStats:
+        """Run one completion through Ollama's native API and report its timings.
+
+        Unlike the OpenAI-compatible endpoint, the native API takes every
+        runtime option, such as ``num_thread`` and ``num_batch``. Raises if
+        the request fails.
+        """
+        import ollama
+        response = ollama.generate(model=model, prompt=prompt, options=options, keep_alive=keep_alive)
+        return GenerationStats(
+            prompt_tokens=response.prompt_eval_count or 0,
+            prompt_seconds=(response.prompt_eval_duration or 0) / 1e9,
+            eval_tokens=response.eval_count or 0,
+            eval_seconds=(response.eval_duration or 0) / 1e9,
+            load_seconds=(response.load_duration or 0) / 1e9
+        )
 
     @staticmethod
     def is_available() -> bool:
         """Check if Ollama is available."""
         try:
+            import ollama
             ollama.list()
             return True
         except Exception as e:
             logging.error(f"Error checking Ollama availability: {e}")
             return False
+
+    @staticmethod
+    def _write_cache(models: List[ModelInfo]) -> None:
+        """Atomically replace the cache file."""
+        data = {"fetched_at": time.time(), "models": [asdict(model) for model in models]}
+        tmp_path = f"{MODELS_CACHE_FILE}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, MODELS_CACHE_FILE)
+        except OSError as e:
+            logging.error(f"Error writing model cache: {e}")
@@ -1,11 +1,20 @@
 """Simplified session service."""
 import sqlite3
 import json
-from typing import List, Dict
+import zlib
+import os
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass
 
-from ..core import DATABASE_PATH
+from ..core import DATABASE_PATH, SNAPSHOT_FILE
+from ..core.database import connect, decode_message, fill_display
+
+# Progress callback: (done, total)
+ProgressCallback = Callable[[int, int], None]
+
+# Rows handled per statement batch in bulk operations
+BULK_CHUNK_SIZE = 500
 
 
 @dataclass
@@ -48,60 +57,82 @@ class SessionInfo:
             return "Unknown"
 
 
+@dataclass
+class DisplayMessage:
+    """A chat message ready to be shown."""
+    role: str
+    text: str
+    message_id: int = 0
+
+
+@dataclass
+class SessionSnapshot:
+    """The tail of the conversation shown when the main window was hidden."""
+    session_id: str
+    messages: List[Tuple[str, bool]]
+    scroll_offset: int = 0  # Pixels above the bottom of the view
+
+
 class SessionService:
     """Service for managing sessions."""
     
     def __init__(self):
         self.db_path = str(DATABASE_PATH)
 
-    def get_sessions(self, limit: int = 50) -> List[SessionInfo]:
-        """Get all sessions."""
+    def get_sessions(self, limit: int = 50,
+                     after: Optional[SessionInfo] = None) -> List[SessionInfo]:
+        """Get sessions, most recently updated first.
+        
+        Pass the last session of the previous page as ``after`` to fetch the
+        next page; each page is an index range scan, so paging through
+        thousands of sessions stays cheap.
+        """
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
-                query = """
+                where = ""
+                params: list = []
+                if after is not None:
+                    where = """
+                WHERE s.updated_at <= ?
+                  AND (s.updated_at < ? OR s.session_id < ?)"""
+                    params = [after.updated_at, after.updated_at, after.session_id]
+                
+                query = f"""
                 SELECT 
                     s.session_id,
                     s.created_at,
                     s.updated_at,
-                    COUNT(m.id) as message_count,
                     (
-                        SELECT m2.message_data 
+                        SELECT COUNT(*)
+                        FROM agent_messages m
+                        WHERE m.session_id = s.session_id
+                    ) as message_count,
+                    (
+                        SELECT m2.display_text 
                         FROM agent_messages m2 
-                        WHERE m2.session_id = s.session_id 
-                        ORDER BY m2.created_at ASC 
+                        WHERE m2.session_id = s.session_id AND m2.role = 'user'
+                        ORDER BY m2.created_at ASC, m2.id ASC
                         LIMIT 1
-                    ) as first_message_data
-                FROM agent_sessions s
-                LEFT JOIN agent_messages m ON s.session_id = m.session_id
-                GROUP BY s.session_id, s.created_at, s.updated_at
-                ORDER BY s.updated_at DESC
+                    ) as preview
+                FROM agent_sessions s{where}
+                ORDER BY s.updated_at DESC, s.session_id DESC
                 LIMIT ?
                 """
                 
-                cursor.execute(query, (limit,))
+                cursor.execute(query, (*params, limit))
                 rows = cursor.fetchall()
                 
                 sessions = []
                 for row in rows:
-                    session_id, created_at, updated_at, message_count, first_message_data = row
-                    
-                    preview = ""
-                    if first_message_data:
-                        try:
-                            msg_json = json.loads(first_message_data)
-                            if msg_json.get('role') == 'user':
-                                preview = msg_json.get('content', '')
-                        except:
-                            pass
-                    
+                    session_id, created_at, updated_at, message_count, preview = row
                     sessions.append(SessionInfo(
                         session_id=session_id,
                         created_at=created_at,
                         updated_at=updated_at,
                         message_count=message_count,
-                        preview=preview
+                        preview=preview or ""
                     ))
                 
                 return sessions
@@ -123,13 +154,125 @@ class SessionService:
             print(f"Error deleting session {session_id}: {e}")
             return False
 
+    def delete_sessions(self, session_ids: Iterable[str],
+                        progress: Optional[ProgressCallback] = None) -> int:
+        """Delete many sessions in a single transaction.
+        
+        Returns the number of sessions deleted. Errors are raised so that
+        background callers can report them; nothing is deleted on failure.
+        """
+        session_ids = list(session_ids)
+        with connect(self.db_path) as conn:
+            return self._delete_sessions(conn, session_ids, progress)
+
+    def delete_sessions_older_than(self, days: int,
+                                   progress: Optional[ProgressCallback] = None) -> int:
+        """Delete every session not updated in the last ``days`` days."""
+        with connect(self.db_path) as conn:
+            session_ids = [row[0] for row in conn.execute(
+                "SELECT session_id FROM agent_sessions WHERE updated_at < datetime('now', ?)",
+                (f"-{int(days)} days",)
+            )]
+            return self._delete_sessions(conn, session_ids, progress)
+
+    def export_sessions(self, session_ids: Iterable[str], path: str,
+                        progress: Optional[ProgressCallback] = None) -> int:
+        """Export sessions with their full messages to a JSON file.
+        
+        All sessions are read from one consistent snapshot and written one at
+        a time, so memory use stays flat for large exports.
+        """
+        session_ids = list(session_ids)
+        total = len(session_ids)
+        with connect(self.db_path) as conn, open(path, 'w', encoding='utf-8') as f:
+            conn.execute("BEGIN")
+            f.write("[\n")
+            exported = 0
+            for done, session_id in enumerate(session_ids, start=1):
+                row = conn.execute(
+                    "SELECT created_at, updated_at FROM agent_sessions WHERE session_id = ?",
+                    (session_id,)
+                ).fetchone()
+                if row:
+                    messages = []
+                    for (message_data,) in conn.execute(
+                        "SELECT message_data FROM agent_messages "
+                        "WHERE session_id = ? ORDER BY created_at, id",
+                        (session_id,)
+                    ):
+                        try:
+                            messages.append(decode_message(message_data))
+                        except (json.JSONDecodeError, zlib.error):
+                            continue
+                    if exported:
+                        f.write(",\n")
+                    json.dump({
+                        "session_id": session_id,
+                        "created_at": row[0],
+                        "updated_at": row[1],
+                        "messages": messages
+                    }, f, ensure_ascii=False)
+                    exported += 1
+                if progress and (done % BULK_CHUNK_SIZE == 0 or done == total):
+                    progress(done, total)
+            f.write("\n]\n")
+            return exported
+
+    @staticmethod
+    def save_snapshot(snapshot: Optional[SessionSnapshot]) -> None:
+        """Store the snapshot to restore on next start; None removes it."""
+        try:
+            if snapshot is None or not snapshot.messages:
+                SNAPSHOT_FILE.unlink(missing_ok=True)
+                return
+            data = {
+                "session_id": snapshot.session_id,
+                "messages": [[text, is_user] for text, is_user in snapshot.messages],
+                "scroll_offset": snapshot.scroll_offset
+            }
+            tmp_path = f"{SNAPSHOT_FILE}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, SNAPSHOT_FILE)
+        except OSError as e:
+            print(f"Error saving session snapshot: {e}")
+
+    @staticmethod
+    def load_snapshot() -> Optional[SessionSnapshot]:
+        """Read the stored snapshot, if there is a usable one."""
+        try:
+            with open(SNAPSHOT_FILE, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return SessionSnapshot(
+                session_id=str(data["session_id"]),
+                messages=[(str(text), bool(is_user)) for text, is_user in data["messages"]],
+                scroll_offset=int(data.get("scroll_offset", 0))
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    @staticmethod
+    def _delete_sessions(conn: sqlite3.Connection, session_ids: List[str],
+                         progress: Optional[ProgressCallback]) -> int:
+        """Delete sessions in chunks on an open transaction."""
+        total = len(session_ids)
+        deleted = 0
+        for start in range(0, total, BULK_CHUNK_SIZE):
+            chunk = [(session_id,) for session_id in session_ids[start:start + BULK_CHUNK_SIZE]]
+            conn.executemany("DELETE FROM agent_messages WHERE session_id = ?", chunk)
+            cursor = conn.executemany("DELETE FROM agent_sessions WHERE session_id = ?", chunk)
+            deleted += cursor.rowcount
+            if progress:
+                progress(min(start + BULK_CHUNK_SIZE, total), total)
+        return deleted
+
     def get_messages(self, session_id: str) -> List[Dict]:
         """Get messages for a session."""
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
-                    "SELECT message_data FROM agent_messages WHERE session_id = ? ORDER BY created_at",
+                    "SELECT message_data FROM agent_messages WHERE session_id = ? ORDER BY created_at, id",
                     (session_id,)
                 )
                 rows = cursor.fetchall()
@@ -137,12 +280,53 @@ class SessionService:
                 messages = []
                 for row in rows:
                     try:
-                        msg_data = json.loads(row[0])
+                        msg_data = decode_message(row[0])
                         messages.append(msg_data)
-                    except json.JSONDecodeError:
+                    except (json.JSONDecodeError, zlib.error):
                         continue
                 
                 return messages
         except Exception as e:
             print(f"Error getting messages for session {session_id}: {e}")
             return []
+
+    def get_display_messages(self, session_id: str, limit: Optional[int] = None,
+                             before_id: Optional[int] = None) -> List[DisplayMessage]:
+        """Get the user and assistant messages of a session, ready to render.
+
+        Reads the pre-extracted ``role`` and ``display_text`` columns, so no
+        message payload is decoded once they are filled in; rows of this
+        session the background backfill has not reached yet are filled in
+        first. With ``limit`` only the latest messages
+        are returned, and ``before_id`` pages further back from a previously
+        returned ``message_id``. Messages are always in chronological order.
+        """
+        query = (
+            "SELECT id, role, display_text FROM agent_messages "
+            "WHERE session_id = ? AND display_text IS NOT NULL"
+        )
+        params: list = [session_id]
+        if before_id is not None:
+            query += " AND id < ?"
+            params.append(before_id)
+        query += " ORDER BY id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                unfilled = cursor.execute(
+                    "SELECT id, message_data FROM agent_messages "
+                    "WHERE session_id = ? AND role IS NULL", (session_id,)
+                ).fetchall()
+                if unfilled:
+                    fill_display(conn, unfilled)
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
+                rows.reverse()
+                return [DisplayMessage(role, text, message_id) for message_id, role, text in rows]
+        except Exception as e:
+            print(f"Error getting display messages for session {session_id}: {e}")
+            return []
@@ -1,29 +1,98 @@
 """Main application class."""
+import importlib
+import sqlite3
 import sys
+
 from PyQt6.QtWidgets import QApplication, QSystemTrayIcon, QMenu, QStyle
 from PyQt6.QtGui import QAction
+from PyQt6.QtCore import QTimer, QFileSystemWatcher
+
+from typing import Any, Dict, List
+
+from ..core import (
+    config, MAINTENANCE_INTERVAL_MS, WARMUP_DELAY_MS, INSTANCE_SOCKET, CONFIG_DIR, CONFIG_FILE
+)
+from ..services import MaintenanceService
+from ..utils import ThreadManager, BackgroundRunner, SingleInstance
+from .styles import STYLESHEET
+from .quick_ask import QuickAskWindow
 
-from .windows import MainWindow, SettingsWindow
+# Slow third-party imports needed by the main window, preloaded off-thread
+HEAVY_MODULES = ("agents", "openai", "ollama", "markdown2", "pygments.lexers")
+
+
+def _import_heavy_modules() -> None:
+    """Import the main window's dependencies; runs on a worker thread."""
+    for name in HEAVY_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
 
 
 class DesktopAI:
-    """Main application with system tray support."""
+    """Main application with system tray support.
+
+    Only the tray icon is created at startup. The main window, and with it
+    the agent runtime, is built the first time it is needed, or after an
+    idle warm-up that imports its dependencies in the background.
+    """
 
     def __init__(self, app: QApplication):
         self.app = app
         self.app.setQuitOnLastWindowClosed(False)
 
+        # One application-wide stylesheet; widgets are styled by object name
+        self.app.setStyleSheet(STYLESHEET)
+
         # Check if system tray is available
         if not QSystemTrayIcon.isSystemTrayAvailable():
             print("System tray is not available on this system.")
             sys.exit(1)
 
-        # Main window
-        self.main_window = MainWindow()
+        # Main window, created on demand
+        self.main_window = None
+
+        # Quick-ask popup, built now so opening it is instant
+        self.quick_ask = QuickAskWindow()
+        self.quick_ask.promote_requested.connect(self._open_session)
 
         # System tray
         self._setup_system_tray()
 
+        # Commands forwarded by later launches
+        self.instance = SingleInstance(INSTANCE_SOCKET)
+        self.instance.command_received.connect(self.handle_command)
+        self.instance.listen()
+        self.app.aboutToQuit.connect(self.instance.close)
+        self.app.aboutToQuit.connect(self._save_snapshot)
+
+        # Preload the main window once the desktop has settled
+        self.warmup = BackgroundRunner(max_workers=1)
+        self.warmup.result_ready.connect(lambda key, result: self._finish_warmup())
+        QTimer.singleShot(WARMUP_DELAY_MS, self._start_warmup)
+
+        # Apply edits made to config.json while running. The directory is
+        # watched too because saving replaces the file.
+        self.config_watcher = QFileSystemWatcher([str(CONFIG_DIR)])
+        self._watch_config_file()
+        self.config_timer = QTimer()
+        self.config_timer.setSingleShot(True)
+        self.config_timer.setInterval(200)
+        self.config_timer.timeout.connect(self._reload_config)
+        self.config_watcher.fileChanged.connect(lambda path: self.config_timer.start())
+        self.config_watcher.directoryChanged.connect(lambda path: self.config_timer.start())
+
+        # Idle database maintenance
+        self.maintenance_service = MaintenanceService()
+        self.maintenance_manager = ThreadManager()
+        self.maintenance_timer = QTimer()
+        self.maintenance_timer.timeout.connect(self._run_maintenance)
+        self.maintenance_timer.start(MAINTENANCE_INTERVAL_MS)
+
+        # Fill in the display text of messages stored before it was kept
+        self.maintenance_manager.start_task(self._backfill_task)
+
     def _setup_system_tray(self):
         """Setup system tray icon and menu."""
         self.tray_icon = QSystemTrayIcon()
@@ -48,34 +117,114 @@ class DesktopAI:
 
     def _setup_tray_menu(self):
         """Setup system tray menu."""
-        menu = QMenu(self.main_window)
+        self.tray_menu = QMenu()
+
+        quick_action = QAction("Quick Ask", self.tray_menu)
+        quick_action.triggered.connect(lambda: self.quick_ask.popup())
+        self.tray_menu.addAction(quick_action)
 
-        show_action = QAction("Show", self.main_window)
+        show_action = QAction("Show", self.tray_menu)
         show_action.triggered.connect(self._show_window)
-        menu.addAction(show_action)
+        self.tray_menu.addAction(show_action)
 
-        settings_action = QAction("Settings", self.main_window)
+        settings_action = QAction("Settings", self.tray_menu)
         settings_action.triggered.connect(self._show_settings)
-        menu.addAction(settings_action)
+        self.tray_menu.addAction(settings_action)
 
-        menu.addSeparator()
+        debug_action = QAction("Debug Info", self.tray_menu)
+        debug_action.triggered.connect(self._show_debug)
+        self.tray_menu.addAction(debug_action)
 
-        exit_action = QAction("Exit", self.main_window)
+        self.tray_menu.addSeparator()
+
+        exit_action = QAction("Exit", self.tray_menu)
         exit_action.triggered.connect(self.app.quit)
-        menu.addAction(exit_action)
+        self.tray_menu.addAction(exit_action)
+
+        self.tray_icon.setContextMenu(self.tray_menu)
 
-        self.tray_icon.setContextMenu(menu)
+    def handle_command(self, command: List[str]):
+        """Run a command line such as ``["show"]``, ``["ask", prompt]`` or ``["quick"]``."""
+        if not command:
+            return
+        action, args = command[0], command[1:]
+        if action == "show":
+            self._show_window()
+        elif action == "ask":
+            self._show_window()
+            self.main_window.ask(" ".join(args))
+        elif action == "quick":
+            self.quick_ask.popup(" ".join(args))
+        else:
+            print(f"Unknown command: {action}")
+
+    def _watch_config_file(self):
+        """Watch config.json, which is a new file after every save."""
+        if CONFIG_FILE.exists() and str(CONFIG_FILE) not in self.config_watcher.files():
+            self.config_watcher.addPath(str(CONFIG_FILE))
+
+    def _reload_config(self):
+        """Apply external changes to the configuration."""
+        self._watch_config_file()
+        changes = config.reload()
+        if changes:
+            self._apply_settings(changes)
+
+    def _apply_settings(self, changes: Dict[str, Any]):
+        """Pass changed settings on to the windows that use them."""
+        if self.main_window is not None:
+            self.main_window.apply_settings(changes)
+
+    def _save_snapshot(self):
+        """Remember the open conversation for the next start."""
+        if self.main_window is not None:
+            self.main_window.save_snapshot()
+
+    def _start_warmup(self):
+        """Import the main window's dependencies in the background."""
+        if self.main_window is None:
+            self.warmup.submit("imports", _import_heavy_modules)
+
+    def _finish_warmup(self):
+        """Build the main window and the quick-ask agent once imports are done."""
+        self._ensure_main_window()
+        self.quick_ask.prepare()
+
+    def _ensure_main_window(self):
+        """Create the main window on first use."""
+        if self.main_window is None:
+            from .windows import MainWindow
+            self.main_window = MainWindow()
+        return self.main_window
 
     def _show_window(self):
         """Show main window."""
-        self.main_window.showNormal()
-        self.main_window.activateWindow()
+        window = self._ensure_main_window()
+        window.showNormal()
+        window.activateWindow()
+
+    def _open_session(self, session_id: str):
+        """Continue a conversation in the main window."""
+        self._show_window()
+        self.main_window.open_session(session_id)
 
     def _show_settings(self):
         """Show settings window."""
+        from .windows import SettingsWindow
+        window = self._ensure_main_window()
         dialog = SettingsWindow(
-            agent=self.main_window.agent,
-            parent=self.main_window
+            agent=window.agent,
+            parent=window
+        )
+        dialog.exec()
+
+    def _show_debug(self):
+        """Show the debug panel for the main chat view."""
+        from .windows import DebugWindow
+        window = self._ensure_main_window()
+        dialog = DebugWindow(
+            chat_widget=window.chat_widget,
+            parent=window
         )
         dialog.exec()
 
@@ -83,21 +232,42 @@ class DesktopAI:
         """Handle tray icon activation."""
         try:
             if reason == QSystemTrayIcon.ActivationReason.Trigger:
-                if self.main_window.isVisible():
+                if self.main_window is not None and self.main_window.isVisible():
                     self.main_window.hide()
                 else:
                     self._show_window()
         except Exception as e:
             # Fallback: just show window on any activation
-            if self.main_window.isVisible():
+            if self.main_window is not None and self.main_window.isVisible():
                 self.main_window.hide()
             else:
                 self._show_window()
 
+    def _run_maintenance(self):
+        """Compact the database unless a chat request is in flight."""
+        chatting = self.main_window is not None and self.main_window.thread_manager.is_active()
+        if chatting or self.maintenance_manager.is_active():
+            return
+        self.maintenance_manager.start_task(self._maintenance_task)
+
+    async def _maintenance_task(self):
+        """Maintenance body, executed on the worker thread."""
+        return self.maintenance_service.run(
+            retention_days=config.retention_days,
+            retention_max_mb=config.retention_max_mb
+        )
+
+    async def _backfill_task(self):
+        """Display text backfill, executed on the worker thread."""
+        try:
+            return self.maintenance_service.backfill_display()
+        except sqlite3.Error as e:
+            print(f"Error backfilling display text: {e}")
+            return 0
+
     def run(self):
         """Run the application."""
-        # Start hidden by default since we're running as daemon
-        self.main_window.hide()
-
+        # Start hidden by default since we're running as daemon; the main
+        # window is created on first show or by the warm-up
         # Execute the Qt event loop
         return self.app.exec()
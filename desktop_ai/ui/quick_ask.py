@@ -0,0 +1,168 @@
+"""Quick-ask popup for one-off questions."""
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QTextBrowser
+)
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtGui import QCursor, QGuiApplication, QTextCursor
+
+from ..core import config
+from ..utils import ThreadManager
+
+
+class QuickAskWindow(QWidget):
+    """Small frameless window that answers a question inline.
+
+    It is built hidden at startup and only shown and focused when triggered,
+    so opening it costs no widget construction. The agent is created on
+    first use, or earlier by ``prepare`` once the warm-up has imported its
+    dependencies, and follows model and prompt changes made elsewhere. Each
+    opening starts a new conversation, which can be handed to the main
+    window with "Open in Chat".
+    """
+
+    promote_requested = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__(None, Qt.WindowType.Tool | Qt.WindowType.FramelessWindowHint
+                         | Qt.WindowType.WindowStaysOnTopHint)
+        self.setObjectName("quickAsk")
+        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground)
+        self.setWindowTitle("Quick Ask")
+        self.setFixedWidth(600)
+
+        self.agent = None
+        self._agent_settings = None
+        self._new_session = True
+        self._answer_text = ""
+        self.thread_manager = ThreadManager()
+
+        self._setup_ui()
+
+    def _setup_ui(self):
+        """Setup the user interface."""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(12, 12, 12, 12)
+
+        self.input_box = QLineEdit()
+        self.input_box.setPlaceholderText("Ask anything...")
+        self.input_box.returnPressed.connect(self._submit)
+        layout.addWidget(self.input_box)
+
+        self.answer_view = QTextBrowser()
+        self.answer_view.setOpenExternalLinks(True)
+        self.answer_view.setMinimumHeight(200)
+        self.answer_view.hide()
+        layout.addWidget(self.answer_view)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        self.promote_button = QPushButton("Open in Chat")
+        self.promote_button.setObjectName("historyButton")
+        self.promote_button.setToolTip("Continue this conversation in the main window")
+        self.promote_button.clicked.connect(self._promote)
+        self.promote_button.hide()
+        buttons.addWidget(self.promote_button)
+        layout.addLayout(buttons)
+
+    def prepare(self):
+        """Create the agent ahead of the first question, or catch up with settings."""
+        if self.agent is None:
+            from ..agent import ChatAgent
+            self.agent = ChatAgent()
+            self._new_session = False
+        elif self._agent_settings is not None:
+            model, system_prompt, profiles = self._agent_settings
+            if config.model and config.model != model:
+                self.agent.update_model(config.model)
+            elif config.model_profiles != profiles:
+                self.agent.update_profile()
+            if config.system_prompt != system_prompt:
+                self.agent.update_system_prompt(config.system_prompt)
+        self._agent_settings = (config.model, config.system_prompt, config.model_profiles)
+
+    def popup(self, prompt: str = ""):
+        """Show the popup near the cursor with the input focused."""
+        if not self.thread_manager.is_active():
+            self._new_session = True
+            self._answer_text = ""
+            self.input_box.clear()
+            self.answer_view.clear()
+            self.answer_view.hide()
+            self.promote_button.hide()
+            self.adjustSize()
+
+        screen = QGuiApplication.screenAt(QCursor.pos()) or QGuiApplication.primaryScreen()
+        if screen:
+            area = screen.availableGeometry()
+            self.move(area.center().x() - self.width() // 2, area.top() + area.height() // 4)
+
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        self.input_box.setFocus()
+
+        if prompt:
+            self.input_box.setText(prompt)
+            self._submit()
+
+    def _submit(self):
+        """Send the question and stream the answer inline."""
+        text = self.input_box.text().strip()
+        if not text or self.thread_manager.is_active():
+            return
+
+        self.prepare()
+        if self._new_session:
+            self.agent.reset()
+            self._new_session = False
+
+        self._answer_text = ""
+        self.answer_view.clear()
+        self.answer_view.show()
+        self.promote_button.hide()
+        self.input_box.setEnabled(False)
+        self.adjustSize()
+
+        try:
+            worker = self.thread_manager.start_task(self.agent.stream_response, text)
+            worker.chunk_ready.connect(self._append_chunk)
+            worker.result_ready.connect(self._handle_response)
+            worker.error_occurred.connect(self._handle_error)
+        except RuntimeError:
+            self.input_box.setEnabled(True)
+
+    def _append_chunk(self, chunk: str):
+        """Show streamed text as it arrives; it is formatted once complete."""
+        self._answer_text += chunk
+        self.answer_view.moveCursor(QTextCursor.MoveOperation.End)
+        self.answer_view.insertPlainText(chunk)
+
+    def _handle_response(self, response: str):
+        """Format the finished answer."""
+        self.answer_view.setMarkdown(self._answer_text)
+        self._finish()
+
+    def _handle_error(self, error: str):
+        """Show an error in place of the answer."""
+        self.answer_view.setPlainText(f"Error: {error}")
+        self._finish()
+
+    def _finish(self):
+        """Re-enable input for a follow-up question."""
+        self.promote_button.show()
+        self.input_box.clear()
+        self.input_box.setEnabled(True)
+        self.input_box.setFocus()
+
+    def _promote(self):
+        """Hand the conversation to the main window."""
+        if self.agent is not None and self.agent.session is not None:
+            self.promote_requested.emit(self.agent.session.session_id)
+        self.hide()
+
+    def keyPressEvent(self, a0):
+        """Hide on Escape."""
+        if a0 and a0.key() == Qt.Key.Key_Escape:
+            self.hide()
+            return
+        super().keyPressEvent(a0)
@@ -116,6 +116,13 @@ QPushButton#sendButton:pressed {
     border: 2px solid #89dceb;
 }
 
+/* Quick-ask popup */
+QWidget#quickAsk {
+    background-color: #1e1e2e;
+    border: 2px solid #89b4fa;
+    border-radius: 12px;
+}
+
 QComboBox { 
     background-color: #181825; 
     color: #cdd6f4; 
@@ -228,6 +235,10 @@ QLabel {
     font-family: 'Segoe UI', 'SF Pro Display', system-ui, sans-serif;
 }
 
+QLabel#modelLabel {
+    margin-right: 8px;
+}
+
 QScrollArea {
     background-color: #181825;
     border: none;
@@ -259,7 +270,7 @@ QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {
     background: none; 
 }
 
-QListWidget {
+QListView#sessionList {
     background-color: #181825;
     color: #cdd6f4;
     border: 2px solid #313244;
@@ -269,24 +280,15 @@ QListWidget {
     font-family: 'Segoe UI', 'SF Pro Display', system-ui, sans-serif;
 }
 
-QListWidget::item {
-    background-color: #1e1e2e;
-    border: 1px solid #313244;
-    border-radius: 8px;
-    margin: 2px;
-    padding: 0px;  /* Remove padding to let the widget handle it */
-    min-height: 65px;  /* Ensure minimum height for proper text display */
-}
+/* Session rows are painted by SessionDelegate */
 
-QListWidget::item:selected {
-    background-color: #45475a;
-    color: #cdd6f4;
-    border: 2px solid #585b70;
+QListView#chatView {
+    background-color: #181825;
+    border: none;
+    padding: 4px 0px;
 }
 
-QListWidget::item:hover {
-    background-color: #313244;
-}
+/* Message bubbles are painted by MessageDelegate */
 
 QDialog {
     background-color: #1e1e2e;
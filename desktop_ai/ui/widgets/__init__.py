@@ -1,4 +1,5 @@
 """UI widgets."""
 from .chat_widget import ChatWidget
+from .session_list import SessionList, SessionListModel
 
-__all__ = ["ChatWidget"]
+__all__ = ["ChatWidget", "SessionList", "SessionListModel"]
@@ -1,16 +1,41 @@
-"""Modern chat display widget using native Qt widgets."""
+"""Chat display built on a virtualized list view."""
+import hashlib
+import html
+import itertools
 import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QScrollArea, 
-    QFrame, QSizePolicy, QSpacerItem
+    QListView, QStyledItemDelegate, QStyleOptionViewItem,
+    QAbstractItemView, QMenu, QApplication
+)
+from PyQt6.QtCore import (
+    Qt, QAbstractListModel, QModelIndex, QSize, QRectF, QPoint, QPointF, QTimer,
+    pyqtSignal
+)
+from PyQt6.QtGui import (
+    QFont, QColor, QPen, QPainter, QPalette, QTextDocument, QTextCursor,
+    QTextBlockFormat, QTextCharFormat,
+    QAbstractTextDocumentLayout
 )
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont
 import markdown2
 
+from ...core import config
+from ...utils import BackgroundRunner
+from .code_highlighter import CodeHighlighter
+
 # Compile regex pattern once at module level for better performance
 MARKDOWN_PATTERN = re.compile(r'```|`|\*\*|\*|#{1,6}\s|^\s*[-*+]\s|^\s*\d+\.\s', re.MULTILINE)
 
+# Closed fenced code blocks; these are rendered separately from the markdown
+FENCE_PATTERN = re.compile(
+    r'^(?P<indent> {0,3})```[ \t]*(?P<language>[\w+#.-]*)[^\n]*\n(?P<code>.*?)^(?P=indent)```[ \t]*$',
+    re.MULTILINE | re.DOTALL
+)
+
 
 class MarkdownStyler:
     """Handles markdown styling and HTML formatting."""
@@ -26,6 +51,18 @@ class MarkdownStyler:
         'em': 'color: #a6e3a1; font-style: italic;'
     }
     
+    # Rendered HTML cache, keyed by content hash and theme, bounded by
+    # entry count and total HTML size
+    CACHE_SIZE = 512
+    CACHE_MAX_CHARS = 8 * 1024 * 1024
+    _cache: "OrderedDict[Tuple[bytes, int], str]" = OrderedDict()
+    _cache_chars = 0
+    _cache_lock = threading.Lock()
+    
+    # Messages above this size, or with several code blocks, render off-thread
+    BACKGROUND_MIN_CHARS = 4000
+    BACKGROUND_MIN_FENCES = 4
+    
     @classmethod
     def has_markdown(cls, text: str) -> bool:
         """Efficiently detect if text contains markdown formatting."""
@@ -38,186 +75,761 @@ class MarkdownStyler:
             html_content = html_content.replace(f'<{tag}>', f'<{tag} style="{style}">')
         return html_content
     
+    @classmethod
+    def to_html(cls, text: str, highlight: bool = True) -> str:
+        """Convert markdown to styled HTML unconditionally.
+        
+        Fenced code blocks are cut out and rendered by ``code_html`` so they
+        can be syntax highlighted; the prose around them goes to markdown2.
+        """
+        parts = []
+        pos = 0
+        for match in FENCE_PATTERN.finditer(text):
+            parts.append(cls._markdown_html(text[pos:match.start()]))
+            parts.append(cls.code_html(match.group('code'), match.group('language'), highlight))
+            pos = match.end()
+        parts.append(cls._markdown_html(text[pos:]))
+        return "".join(parts)
+    
+    @classmethod
+    def _markdown_html(cls, text: str) -> str:
+        if not text.strip():
+            return ""
+        html_content = markdown2.markdown(text, extras=["fenced-code-blocks", "tables"])
+        return cls.apply_styles(html_content)
+    
+    @classmethod
+    def code_html(cls, code: str, language: str, highlight: bool = True) -> str:
+        """Render a code block, highlighted when possible."""
+        if code.endswith("\n"):
+            code = code[:-1]
+        body = CodeHighlighter.highlight(code, language) if highlight else None
+        if body is None:
+            return (f'<pre style="{cls.STYLES["pre"]}"><code style="{cls.STYLES["code"]}">'
+                    f'{html.escape(code, quote=False)}</code></pre>')
+        return f'<pre style="{cls.STYLES["pre"]}">{body}</pre>'
+    
     @classmethod
     def process_markdown(cls, text: str) -> str:
         """Process markdown text and apply styling."""
         if not cls.has_markdown(text):
             return text
-        
-        html_content = markdown2.markdown(text, extras=["fenced-code-blocks", "tables"])
-        return cls.apply_styles(html_content)
+        return cls.to_html(text)
+    
+    @classmethod
+    def _cache_key(cls, text: str) -> Tuple[bytes, int]:
+        theme = hash((tuple(cls.STYLES.items()), tuple(CodeHighlighter.TOKEN_COLORS.items()),
+                      CodeHighlighter.available()))
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest(), theme
+    
+    @classmethod
+    def cached(cls, text: str) -> Optional[str]:
+        """Get previously rendered HTML for ``text``, if any."""
+        key = cls._cache_key(text)
+        with cls._cache_lock:
+            html = cls._cache.get(key)
+            if html is not None:
+                cls._cache.move_to_end(key)
+            return html
+    
+    @classmethod
+    def render(cls, text: str) -> str:
+        """Process markdown through the LRU cache. Safe to call from any thread."""
+        html = cls.cached(text)
+        if html is None:
+            html = cls.process_markdown(text)
+            cls.store(text, html)
+        return html
+    
+    @classmethod
+    def store(cls, text: str, html: str):
+        """Cache HTML rendered for ``text``."""
+        key = cls._cache_key(text)
+        with cls._cache_lock:
+            if key not in cls._cache:
+                cls._cache[key] = html
+                cls._cache_chars += len(html)
+            while len(cls._cache) > cls.CACHE_SIZE or cls._cache_chars > cls.CACHE_MAX_CHARS:
+                _, evicted = cls._cache.popitem(last=False)
+                cls._cache_chars -= len(evicted)
+    
+    @classmethod
+    def cache_stats(cls) -> Tuple[int, int]:
+        """Number of cached renders and their total size in characters."""
+        with cls._cache_lock:
+            return len(cls._cache), cls._cache_chars
+    
+    @classmethod
+    def is_expensive(cls, text: str) -> bool:
+        """Whether rendering ``text`` is slow enough to keep off the GUI thread."""
+        return len(text) >= cls.BACKGROUND_MIN_CHARS or text.count('```') >= cls.BACKGROUND_MIN_FENCES
+
 
+class IncrementalMarkdownRenderer:
+    """Renders a growing markdown text without re-converting finished blocks.
 
-class MessageBubble(QFrame):
-    """Individual message bubble widget."""
+    The text is split at blank lines outside code fences. Everything before
+    the last such boundary is finished: it is converted once and frozen.
+    Only the trailing open block (an unfinished paragraph, or a code fence
+    that has not been closed yet) is converted again on each update, so the
+    cost of an update does not grow with the length of the response.
     
-    def __init__(self, text: str, is_user: bool = False, parent=None):
-        super().__init__(parent)
-        self.is_user = is_user
-        # Set transparent background for the container
-        self.setStyleSheet("QFrame { background: transparent; border: none; }")
-        self.setup_ui(text)
-    
-    def setup_ui(self, text: str):
-        """Setup the bubble UI."""
-        # Main container layout
-        container_layout = QHBoxLayout(self)
-        container_layout.setContentsMargins(10, 5, 10, 5)
-        
-        if self.is_user:
-            # User message: add spacer first, then bubble (align right)
-            # Spacer takes 30% of space, bubble takes the rest
-            container_layout.addItem(QSpacerItem(0, 0, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum))
-            
-            # Create the bubble frame
-            bubble_frame = QFrame()
-            bubble_frame.setStyleSheet("""
-                QFrame {
-                    background-color: #45475a;
-                    color: #cdd6f4;
-                    border-radius: 15px;
-                    border: 1px solid #6c7086;
-                    padding: 12px 16px;
-                }
-            """)
-            
-            # Create the message label
-            message_label = QLabel()
-            message_label.setWordWrap(True)
-            message_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
-            message_label.setStyleSheet("background: transparent; color: #cdd6f4; font-weight: 500; font-size: 14px;")
-            message_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
-            
-            # Enable HTML rendering for markdown
-            message_label.setTextFormat(Qt.TextFormat.RichText)
-            
-            # Set font
-            font = QFont("Segoe UI", 10)
-            font.setWeight(QFont.Weight.Normal)
-            message_label.setFont(font)
-            
-            # Process markdown for user messages using the styler
-            processed_text = MarkdownStyler.process_markdown(text)
-            message_label.setText(processed_text)
-            
-            # Simple layout for the bubble
-            bubble_layout = QVBoxLayout(bubble_frame)
-            bubble_layout.setContentsMargins(0, 0, 0, 0)
-            bubble_layout.addWidget(message_label)
-            
-            container_layout.addWidget(bubble_frame, 2)  # Takes 2/3 of remaining space
-            
-        else:
-            # Assistant message: bubble first, then spacer (align left)
-            
-            # Create the bubble frame
-            bubble_frame = QFrame()
-            bubble_frame.setStyleSheet("""
-                QFrame {
-                    background-color: #313244;
-                    color: #cdd6f4;
-                    border-radius: 15px;
-                    border: 1px solid #45475a;
-                    padding: 12px 16px;
-                }
-            """)
-            
-            # Create the message label
-            message_label = QLabel()
-            message_label.setWordWrap(True)
-            message_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
-            message_label.setStyleSheet("background: transparent; color: #cdd6f4; font-size: 14px;")
-            message_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
-            
-            # Enable HTML rendering for markdown
-            message_label.setTextFormat(Qt.TextFormat.RichText)
-            
-            # Set font
-            font = QFont("Segoe UI", 10)
-            message_label.setFont(font)
-            
-            # Process markdown for assistant messages using the styler
-            processed_text = MarkdownStyler.process_markdown(text)
-            message_label.setText(processed_text)
-            
-            # Simple layout for the bubble
-            bubble_layout = QVBoxLayout(bubble_frame)
-            bubble_layout.setContentsMargins(0, 0, 0, 0)
-            bubble_layout.addWidget(message_label)
-            
-            container_layout.addWidget(bubble_frame, 2)  # Takes 2/3 of space
-            container_layout.addItem(QSpacerItem(0, 0, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum))
-
-
-class ChatWidget(QScrollArea):
-    """Modern chat display widget using native Qt widgets."""
+    Code blocks are highlighted as they are frozen, except large ones, which
+    stay plain here so highlighting never stalls the GUI thread. The result
+    approximates rendering the whole text; callers render the finished text
+    again once the stream ends.
+    """
     
+    def __init__(self):
+        self.text = ""
+        self._frozen_html: List[str] = []
+        self._frozen_end = 0  # Offset in ``text`` where the open block starts
+        self._taken = 0  # Frozen chunks already handed out by take_frozen()
+        self._scan_pos = 0  # Start of the first line not scanned yet
+        self._in_fence = False
+    
+    def append(self, delta: str):
+        """Add streamed text and freeze any blocks it completes."""
+        self.text += delta
+        boundary = None
+        pos = self._scan_pos
+        while True:
+            end = self.text.find("\n", pos)
+            if end == -1:
+                break
+            line = self.text[pos:end]
+            if line.lstrip().startswith("```"):
+                self._in_fence = not self._in_fence
+            elif not self._in_fence and not line.strip():
+                boundary = end + 1
+            pos = end + 1
+        self._scan_pos = pos
+        
+        if boundary is not None:
+            chunk = self.text[self._frozen_end:boundary]
+            if chunk.strip():
+                self._frozen_html.append(self._convert(chunk))
+            self._frozen_end = boundary
+    
+    def take_frozen(self) -> List[str]:
+        """Get the HTML of blocks frozen since the previous call."""
+        chunks = self._frozen_html[self._taken:]
+        self._taken = len(self._frozen_html)
+        return chunks
+    
+    def tail_html(self, highlight: bool = False) -> str:
+        """Render the trailing open block, closing an open code fence.
+        
+        The open block changes on every update, so it is not highlighted
+        unless asked for.
+        """
+        tail = self.text[self._frozen_end:]
+        if not tail.strip():
+            return ""
+        if self._in_fence:
+            tail += "\n```"
+        if highlight:
+            return self._convert(tail)
+        return MarkdownStyler.to_html(tail, highlight=False)
+    
+    def html(self) -> str:
+        """Full HTML of the text received so far."""
+        return "".join(self._frozen_html) + self.tail_html(highlight=True)
+    
+    def _convert(self, chunk: str) -> str:
+        """Convert a finished block, highlighting its code if it is small."""
+        if MarkdownStyler.is_expensive(chunk):
+            return MarkdownStyler.to_html(chunk, highlight=False)
+        return MarkdownStyler.to_html(chunk)
+
+
+@dataclass
+class ChatMessage:
+    """A message shown in the chat view."""
+    text: str
+    is_user: bool
+    # Unique key used by the delegate caches
+    key: int = field(default_factory=itertools.count().__next__)
+    # Set while the message is being streamed
+    renderer: Optional[IncrementalMarkdownRenderer] = None
+
+
+class ChatMessageModel(QAbstractListModel):
+    """List model holding the messages of a conversation."""
+
+    MessageRole = Qt.ItemDataRole.UserRole + 1
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.messages_widget = QWidget()
-        self.messages_layout = QVBoxLayout(self.messages_widget)
-        self.messages_layout.setSpacing(8)
-        self.messages_layout.setContentsMargins(10, 10, 10, 10)
-        
-        # Setup scroll area
-        self.setWidget(self.messages_widget)
-        self.setWidgetResizable(True)
-        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self._messages = []
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._messages)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        message = self._messages[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return message.text
+        if role == self.MessageRole:
+            return message
+        return None
+
+    def index_of(self, message: ChatMessage) -> QModelIndex:
+        """Find the index of a message; recent messages are found fastest."""
+        for row in range(len(self._messages) - 1, -1, -1):
+            if self._messages[row] is message:
+                return self.index(row)
+        return QModelIndex()
+
+    def append_message(self, text: str, is_user: bool) -> ChatMessage:
+        """Append a message at the end of the conversation."""
+        message = ChatMessage(text, is_user)
+        row = len(self._messages)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._messages.append(message)
+        self.endInsertRows()
+        return message
+
+    def insert_messages(self, row: int, messages: List[Tuple[str, bool]]):
+        """Insert ``(text, is_user)`` pairs at ``row`` in a single model change."""
+        if not messages:
+            return
+        self.beginInsertRows(QModelIndex(), row, row + len(messages) - 1)
+        self._messages[row:row] = [ChatMessage(text, is_user) for text, is_user in messages]
+        self.endInsertRows()
+
+    def append_messages(self, messages: List[Tuple[str, bool]]):
+        """Append ``(text, is_user)`` pairs at the end of the conversation."""
+        self.insert_messages(len(self._messages), messages)
+
+    def prepend_messages(self, messages: List[Tuple[str, bool]]):
+        """Insert ``(text, is_user)`` pairs before the first message."""
+        self.insert_messages(0, messages)
+
+    def tail(self, count: int) -> List[Tuple[str, bool]]:
+        """The last ``count`` messages as ``(text, is_user)`` pairs."""
+        return [(message.text, message.is_user) for message in self._messages[-count:]] if count else []
+
+    def begin_stream(self) -> ChatMessage:
+        """Append an empty assistant message that will be streamed into."""
+        message = self.append_message("", is_user=False)
+        message.renderer = IncrementalMarkdownRenderer()
+        return message
+
+    def clear(self):
+        """Remove all messages."""
+        self.beginResetModel()
+        self._messages = []
+        self.endResetModel()
+
+
+class MessageDelegate(QStyledItemDelegate):
+    """Paints messages as rounded bubbles without creating widgets.
+
+    Text layout is the expensive part, so laid-out documents and row heights
+    are cached per message and width; only visible rows are ever painted.
+    Large markdown messages are shown as plain text until their HTML has been
+    rendered on a worker thread.
+
+    Documents are the bulk of the view's memory. They are kept within
+    ``memory_budget`` bytes by evicting the least recently painted ones that
+    are off-screen; an evicted message keeps only its text and row height and
+    is laid out again when it scrolls back into view.
+    """
+
+    ROW_MARGIN_X = 20
+    ROW_MARGIN_Y = 6
+    PADDING_X = 16
+    PADDING_Y = 12
+    RADIUS = 15
+    
+    # Estimated memory of a laid-out document per character of text,
+    # including formats and line layouts; measured on typical chat markdown
+    DOCUMENT_BYTES_PER_CHAR = 24
+
+    TEXT_COLOR = QColor("#cdd6f4")
+    USER_BACKGROUND = QColor("#45475a")
+    USER_BORDER = QColor("#6c7086")
+    ASSISTANT_BACKGROUND = QColor("#313244")
+    ASSISTANT_BORDER = QColor("#45475a")
+    
+    # Built on first use, as fonts need a running application
+    _user_font: Optional[QFont] = None
+    _assistant_font: Optional[QFont] = None
+    _text_palette: Optional[QPalette] = None
+
+    def __init__(self, view: QListView, memory_budget: int = 0):
+        super().__init__(view)
+        self._view = view
+        self.memory_budget = memory_budget  # Bytes; 0 is unlimited
+        self._documents: "OrderedDict[int, QTextDocument]" = OrderedDict()
+        self._document_costs: Dict[int, int] = {}
+        self._document_bytes = 0
+        self._heights: Dict[int, Tuple[int, int]] = {}
         
-        # Style the scroll area
-        self.setStyleSheet("""
-            QScrollArea {
-                background-color: #181825;
-                border: none;
-            }
-            QWidget {
-                background-color: #181825;
-            }
-        """)
+        # Streaming messages: key -> [document, offset where the open block starts]
+        self._streams: Dict[int, list] = {}
         
-        # Add stretch at the end to push messages to the top
-        self.messages_layout.addStretch()
+        self._pending: Dict[str, ChatMessage] = {}
+        # Background renders not laid out yet: key -> HTML. The shared cache
+        # may already have evicted them by the next paint.
+        self._rendered: Dict[int, str] = {}
+        self._renderer = BackgroundRunner(max_workers=1, parent=self)
+        self._renderer.result_ready.connect(self._on_rendered)
+
+        self._build_theme()
     
-    def _add_message_widget(self, widget: QWidget):
-        """Helper method to add a message widget with proper stretch handling."""
-        # Remove the stretch temporarily
-        self.messages_layout.takeAt(self.messages_layout.count() - 1)
+    @classmethod
+    def _build_theme(cls):
+        """Create the fonts and text palette shared by every chat view, once."""
+        if cls._text_palette is not None:
+            return
+        cls._user_font = QFont("Segoe UI")
+        cls._user_font.setPixelSize(14)
+        cls._user_font.setWeight(QFont.Weight.Medium)
+        cls._assistant_font = QFont("Segoe UI")
+        cls._assistant_font.setPixelSize(14)
+        cls._text_palette = QPalette()
+        cls._text_palette.setColor(QPalette.ColorRole.Text, cls.TEXT_COLOR)
+
+    def clear_cache(self):
+        """Drop all cached layouts and pending renders."""
+        for request in self._pending:
+            self._renderer.cancel(request)
+        self._pending.clear()
+        self._rendered.clear()
+        self._streams.clear()
+        self._documents.clear()
+        self._document_costs.clear()
+        self._document_bytes = 0
+        self._heights.clear()
+
+    def invalidate(self, message: ChatMessage):
+        """Forget the layout of a message and have the view relayout its row."""
+        self._drop_document(message.key)
+        self._heights.pop(message.key, None)
+        index = self._view.model().index_of(message)
+        if index.isValid():
+            self.sizeHintChanged.emit(index)
+
+    def update_stream(self, message: ChatMessage):
+        """Apply newly streamed content to a message's document.
         
-        # Add the message widget
-        self.messages_layout.addWidget(widget)
+        Frozen blocks are appended once; only the trailing open block is
+        removed and re-inserted, so Qt relayouts just the changed blocks.
+        """
+        entry = self._streams.get(message.key)
+        if entry is None:
+            entry = self._streams[message.key] = [self._new_document(message), 0]
+        document, frozen_end = entry
         
-        # Add stretch back
-        self.messages_layout.addStretch()
+        cursor = QTextCursor(document)
+        cursor.setPosition(frozen_end)
+        cursor.movePosition(QTextCursor.MoveOperation.End, QTextCursor.MoveMode.KeepAnchor)
+        cursor.removeSelectedText()
+        for chunk in message.renderer.take_frozen():
+            if cursor.position() > 0:
+                # A fresh block format keeps lists and headings from leaking over
+                cursor.insertBlock(QTextBlockFormat(), QTextCharFormat())
+            cursor.insertHtml(chunk)
+        entry[1] = cursor.position()
         
-        # Scroll to bottom
-        self.scroll_to_bottom()
+        tail = message.renderer.tail_html()
+        if tail:
+            if cursor.position() > 0:
+                cursor.insertBlock(QTextBlockFormat(), QTextCharFormat())
+            cursor.insertHtml(tail)
+        
+        self._heights.pop(message.key, None)
+        index = self._view.model().index_of(message)
+        if index.isValid():
+            self.sizeHintChanged.emit(index)
+
+    def restart_stream(self, message: ChatMessage):
+        """Discard streamed content so the message is rebuilt from scratch."""
+        self._streams.pop(message.key, None)
+
+    def finish_stream(self, message: ChatMessage):
+        """Keep the streamed document as the message's regular layout."""
+        entry = self._streams.pop(message.key, None)
+        if entry is not None:
+            self._store_document(message.key, entry[0])
+    
+    def memory_stats(self) -> Dict[str, int]:
+        """Counts and estimated sizes of the cached layouts."""
+        return {
+            "documents": len(self._documents),
+            "document_bytes": self._document_bytes,
+            "streams": len(self._streams),
+            "heights": len(self._heights),
+            "budget": self.memory_budget,
+        }
+    
+    def _store_document(self, key: int, document: QTextDocument):
+        """Cache a document and evict others if over the memory budget."""
+        self._drop_document(key)
+        cost = document.characterCount() * self.DOCUMENT_BYTES_PER_CHAR
+        self._documents[key] = document
+        self._document_costs[key] = cost
+        self._document_bytes += cost
+        self._trim()
+    
+    def _drop_document(self, key: int):
+        """Forget the document of a message; its row height is kept."""
+        if self._documents.pop(key, None) is not None:
+            self._document_bytes -= self._document_costs.pop(key, 0)
+    
+    def release_offscreen(self):
+        """Evict every document that is not currently on screen."""
+        self._trim(0)
+    
+    def _trim(self, budget: Optional[int] = None):
+        """Evict least recently used off-screen documents until within budget."""
+        if budget is None:
+            if not self.memory_budget:
+                return
+            budget = self.memory_budget
+        if self._document_bytes <= budget:
+            return
+        visible = self._visible_keys()
+        for key in list(self._documents):
+            if self._document_bytes <= budget:
+                break
+            if key not in visible:
+                self._drop_document(key)
+    
+    def _visible_keys(self) -> set:
+        """Keys of the messages currently inside the viewport."""
+        model = self._view.model()
+        viewport = self._view.viewport().rect()
+        first = self._view.indexAt(viewport.topLeft())
+        if not first.isValid():
+            return set()
+        last = self._view.indexAt(viewport.bottomLeft())
+        last_row = last.row() if last.isValid() else model.rowCount() - 1
+        return {
+            model.index(row).data(ChatMessageModel.MessageRole).key
+            for row in range(first.row(), last_row + 1)
+        }
+
+    def rerender(self, message: ChatMessage):
+        """Render a message again in the background, keeping its current layout meanwhile."""
+        self._request_render(message)
+    
+    def _request_render(self, message: ChatMessage):
+        """Render a message's markdown in the background."""
+        request = f"render-{message.key}"
+        if request not in self._pending:
+            self._pending[request] = message
+            self._renderer.submit(request, MarkdownStyler.render, message.text)
+
+    def _on_rendered(self, request: str, html: str):
+        """Swap in the rendered HTML of a message."""
+        message = self._pending.pop(request, None)
+        if message is not None:
+            self._rendered[message.key] = html
+            self.invalidate(message)
+
+    def _text_width(self) -> int:
+        """Width available to the text of a bubble."""
+        width = self._view.viewport().width()
+        return max(width - 2 * (self.ROW_MARGIN_X + self.PADDING_X), 50)
+
+    def _new_document(self, message: ChatMessage) -> QTextDocument:
+        """Create an empty document with the message's font."""
+        document = QTextDocument()
+        document.setDocumentMargin(0)
+        document.setDefaultFont(self._user_font if message.is_user else self._assistant_font)
+        return document
+
+    def _document(self, message: ChatMessage, width: int) -> QTextDocument:
+        """Get the laid-out document for a message, creating it if needed."""
+        stream = self._streams.get(message.key)
+        if stream is not None:
+            document = stream[0]
+        else:
+            document = self._documents.get(message.key)
+            if document is None:
+                document = self._new_document(message)
+                html = self._rendered.pop(message.key, None)
+                if html is None and MarkdownStyler.has_markdown(message.text):
+                    html = MarkdownStyler.cached(message.text)
+                    if html is None:
+                        if MarkdownStyler.is_expensive(message.text):
+                            self._request_render(message)
+                        else:
+                            html = MarkdownStyler.render(message.text)
+                if html is None:
+                    document.setPlainText(message.text)
+                else:
+                    document.setHtml(html)
+                self._store_document(message.key, document)
+            else:
+                self._documents.move_to_end(message.key)
+        if document.textWidth() != width:
+            document.setTextWidth(width)
+        return document
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        message = index.data(ChatMessageModel.MessageRole)
+        if message is None:
+            return QSize()
+        width = self._text_width()
+        cached_width, height = self._heights.get(message.key, (None, 0))
+        if cached_width != width:
+            document = self._document(message, width)
+            height = int(document.size().height()) + 2 * (self.PADDING_Y + self.ROW_MARGIN_Y)
+            self._heights[message.key] = (width, height)
+        return QSize(self._view.viewport().width(), height)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        message = index.data(ChatMessageModel.MessageRole)
+        if message is None:
+            return
+        document = self._document(message, self._text_width())
+
+        bubble = QRectF(option.rect).adjusted(
+            self.ROW_MARGIN_X + 0.5, self.ROW_MARGIN_Y + 0.5,
+            -self.ROW_MARGIN_X - 0.5, -self.ROW_MARGIN_Y - 0.5
+        )
+        if message.is_user:
+            background, border = self.USER_BACKGROUND, self.USER_BORDER
+        else:
+            background, border = self.ASSISTANT_BACKGROUND, self.ASSISTANT_BORDER
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QPen(border, 1))
+        painter.setBrush(background)
+        painter.drawRoundedRect(bubble, self.RADIUS, self.RADIUS)
+
+        origin = bubble.topLeft() + QPointF(self.PADDING_X, self.PADDING_Y)
+        painter.translate(origin)
+        context = QAbstractTextDocumentLayout.PaintContext()
+        context.palette = self._text_palette
+        # Only draw the blocks inside the viewport; long messages are mostly off-screen
+        visible = QRectF(self._view.viewport().rect()).intersected(QRectF(option.rect))
+        context.clip = visible.translated(-origin)
+        document.documentLayout().draw(painter, context)
+        painter.restore()
+
+
+class ChatWidget(QListView):
+    """Virtualized chat display: one model row per message, painted by a delegate."""
+    
+    # Minimum interval between repaints of a streaming message (~30 fps)
+    STREAM_FRAME_MS = 33
+    
+    # Emitted when the user scrolls to the top and older messages exist
+    older_requested = pyqtSignal()
+    
+    def __init__(self, parent=None, memory_budget_mb: Optional[int] = None):
+        super().__init__(parent)
+        if memory_budget_mb is None:
+            memory_budget_mb = config.chat_memory_mb
+        self.chat_model = ChatMessageModel(self)
+        self.delegate = MessageDelegate(self, memory_budget=memory_budget_mb * 1024 * 1024)
+        self._stream: Optional[ChatMessage] = None
+        self._stream_timer = QTimer(self)
+        self._stream_timer.setSingleShot(True)
+        self._stream_timer.setInterval(self.STREAM_FRAME_MS)
+        self._stream_timer.timeout.connect(self._flush_stream)
+        
+        # Scroll requests made in the same event loop pass scroll only once;
+        # whether older messages are needed is only known after scrolling
+        self._scroll_timer = QTimer(self)
+        self._scroll_timer.setSingleShot(True)
+        self._scroll_timer.setInterval(0)
+        self._scroll_timer.timeout.connect(self.scrollToBottom)
+        self._scroll_timer.timeout.connect(self._request_older_if_needed)
+        
+        # Windowed history: older pages are requested when scrolling to the top
+        self._has_older = False
+        self._older_pending = False
+        self.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+        self.setModel(self.chat_model)
+        self.setItemDelegate(self.delegate)
+        
+        # Rows have different heights; scroll by pixel and relayout on resize
+        self.setUniformItemSizes(False)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self.verticalScrollBar().setSingleStep(20)
+        
+        # Messages are not selectable text any more; offer copying instead
+        self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.customContextMenuRequested.connect(self._show_context_menu)
+        
+        # Styled by object name in the application stylesheet
+        self.setObjectName("chatView")
     
     def add_user_message(self, text: str):
         """Add user message."""
-        bubble = MessageBubble(text, is_user=True)
-        self._add_message_widget(bubble)
+        self.chat_model.append_message(text, is_user=True)
+        self.scroll_to_bottom()
     
     def add_assistant_message(self, text: str):
         """Add assistant message."""
-        bubble = MessageBubble(text, is_user=False)
-        self._add_message_widget(bubble)
+        self.chat_model.append_message(text, is_user=False)
+        self.scroll_to_bottom()
+    
+    def add_messages(self, messages: List[Tuple[str, bool]]):
+        """Append a batch of ``(text, is_user)`` messages.
+        
+        The rows are inserted in one model change with painting suspended, so
+        loading a conversation costs one layout pass and one scroll.
+        """
+        if not messages:
+            return
+        self.setUpdatesEnabled(False)
+        try:
+            self.chat_model.append_messages(messages)
+            self.executeDelayedItemsLayout()
+        finally:
+            self.setUpdatesEnabled(True)
+        self.scroll_to_bottom()
+    
+    def recent_messages(self, count: int) -> List[Tuple[str, bool]]:
+        """The last ``count`` messages as ``(text, is_user)`` pairs."""
+        return self.chat_model.tail(count)
+    
+    def scroll_offset(self) -> int:
+        """Distance in pixels between the viewport and the bottom."""
+        scrollbar = self.verticalScrollBar()
+        return scrollbar.maximum() - scrollbar.value()
+    
+    def set_scroll_offset(self, offset: int):
+        """Scroll to ``offset`` pixels above the bottom."""
+        self._scroll_timer.stop()
+        scrollbar = self.verticalScrollBar()
+        scrollbar.setValue(max(scrollbar.minimum(), scrollbar.maximum() - offset))
+    
+    def set_has_older(self, has_older: bool):
+        """Tell the view whether older messages can be requested."""
+        self._has_older = has_older
+        self._older_pending = False
+        if has_older and not self._scroll_timer.isActive():
+            # A pending scroll to the bottom runs the check once it is done
+            QTimer.singleShot(0, self._request_older_if_needed)
+    
+    def prepend_messages(self, messages: List[Tuple[str, bool]]):
+        """Insert older ``(text, is_user)`` messages above the current ones.
+        
+        The scroll position is kept on the message the user was looking at.
+        """
+        scrollbar = self.verticalScrollBar()
+        old_value, old_maximum = scrollbar.value(), scrollbar.maximum()
+        self.chat_model.prepend_messages(messages)
+        self.executeDelayedItemsLayout()
+        scrollbar.setValue(old_value + scrollbar.maximum() - old_maximum)
+    
+    def _on_scrolled(self, value: int):
+        """Request older messages when the top is reached."""
+        if value == self.verticalScrollBar().minimum():
+            self._request_older_if_needed()
+    
+    def _request_older_if_needed(self):
+        """Ask for older messages if at the top or the view is not filled yet."""
+        scrollbar = self.verticalScrollBar()
+        if (self._has_older and not self._older_pending
+                and scrollbar.value() == scrollbar.minimum()):
+            self._older_pending = True
+            self.older_requested.emit()
+    
+    def begin_assistant_stream(self):
+        """Start an assistant message that is filled by ``append_stream``."""
+        self.finish_stream()
+        self._stream = self.chat_model.begin_stream()
+        self.scroll_to_bottom()
+    
+    def append_stream(self, delta: str):
+        """Append streamed text; the view updates at most once per frame."""
+        if self._stream is None:
+            self.begin_assistant_stream()
+        self._stream.renderer.append(delta)
+        self._stream.text = self._stream.renderer.text
+        if not self._stream_timer.isActive():
+            self._stream_timer.start()
+    
+    def finish_stream(self, text: Optional[str] = None):
+        """Finish the streaming message, optionally replacing its text."""
+        message = self._stream
+        if message is None:
+            return
+        self._stream_timer.stop()
+        if text is not None and text != message.renderer.text:
+            self.delegate.restart_stream(message)
+            message.renderer = IncrementalMarkdownRenderer()
+            message.renderer.append(text)
+            message.text = text
+        self._flush_stream()
+        # The streamed HTML splits blocks at every blank line, which breaks
+        # constructs such as list items with indented continuations; the
+        # finished text is rendered whole, and only that is cached.
+        streamed_html = message.renderer.html() if MarkdownStyler.has_markdown(message.text) else None
+        message.renderer = None
+        self.delegate.finish_stream(message)
+        self._stream = None
+        if streamed_html is None:
+            return
+        if MarkdownStyler.is_expensive(message.text):
+            # The streamed layout stays until the render lands
+            self.delegate.rerender(message)
+        elif MarkdownStyler.render(message.text) != streamed_html:
+            self.delegate.invalidate(message)
+    
+    def _flush_stream(self):
+        """Render pending streamed text into the view."""
+        if self._stream is None:
+            return
+        scrollbar = self.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+        self.delegate.update_stream(self._stream)
+        if at_bottom:
+            self.scroll_to_bottom()
     
     def clear_chat(self):
         """Clear all messages."""
-        # Remove all widgets except the stretch
-        while self.messages_layout.count() > 1:
-            child = self.messages_layout.takeAt(0)
-            if child and child.widget():
-                widget = child.widget()
-                if widget:
-                    widget.deleteLater()
+        self._stream_timer.stop()
+        self._scroll_timer.stop()
+        self._stream = None
+        self._has_older = False
+        self._older_pending = False
+        self.chat_model.clear()
+        self.delegate.clear_cache()
     
     def scroll_to_bottom(self):
-        """Scroll to the bottom of the chat."""
-        # Force update the layout
-        self.messages_widget.updateGeometry()
-        # Scroll to bottom after a brief delay to ensure layout is updated
-        scrollbar = self.verticalScrollBar()
-        if scrollbar:
-            scrollbar.setValue(scrollbar.maximum())
+        """Scroll to the bottom of the chat once pending rows are laid out."""
+        if not self._scroll_timer.isActive():
+            self._scroll_timer.start()
+    
+    def set_memory_budget(self, memory_budget_mb: int):
+        """Change the rendered message budget, evicting at once if it shrank."""
+        self.delegate.memory_budget = memory_budget_mb * 1024 * 1024
+        self.delegate._trim()
+    
+    def memory_stats(self) -> Dict[str, int]:
+        """Message count, cached layouts and estimated memory of the view."""
+        stats = {"messages": self.chat_model.rowCount()}
+        stats.update(self.delegate.memory_stats())
+        stats["html_cache_entries"], stats["html_cache_chars"] = MarkdownStyler.cache_stats()
+        stats["code_cache_entries"], stats["code_cache_chars"] = CodeHighlighter.cache_stats()
+        return stats
+    
+    def _show_context_menu(self, pos: QPoint):
+        """Offer to copy the message under the cursor."""
+        index = self.indexAt(pos)
+        if not index.isValid():
+            return
+        menu = QMenu(self)
+        copy_action = menu.addAction("Copy Message")
+        if menu.exec(self.viewport().mapToGlobal(pos)) == copy_action:
+            clipboard = QApplication.clipboard()
+            if clipboard:
+                clipboard.setText(index.data(Qt.ItemDataRole.DisplayRole))
@@ -0,0 +1,127 @@
+"""Syntax highlighting for fenced code blocks."""
+import hashlib
+import html
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+try:
+    from pygments import lex
+    from pygments.lexers import get_lexer_by_name
+    from pygments.util import ClassNotFound
+except ImportError:  # Highlighting is optional; code is shown plain without it
+    lex = None
+
+
+class CodeHighlighter:
+    """Turns code into HTML spans with inline colors.
+
+    Qt rich text ignores CSS classes, so colors are inlined per token. Results
+    are cached by language and content hash, and code above ``MAX_CHARS`` is
+    never highlighted. Highlighting is thread-safe and is expected to run on
+    the markdown render worker for anything large.
+    """
+
+    # Catppuccin Mocha colors by pygments token type; unlisted types inherit
+    # from their parent type, and plain text keeps the block's text color.
+    TOKEN_COLORS = {
+        'Token.Keyword': '#cba6f7',
+        'Token.Keyword.Constant': '#fab387',
+        'Token.Name.Builtin': '#f38ba8',
+        'Token.Name.Function': '#89b4fa',
+        'Token.Name.Class': '#f9e2af',
+        'Token.Name.Decorator': '#f5c2e7',
+        'Token.Name.Tag': '#cba6f7',
+        'Token.Name.Attribute': '#f9e2af',
+        'Token.Literal.String': '#a6e3a1',
+        'Token.Literal.Number': '#fab387',
+        'Token.Operator': '#89dceb',
+        'Token.Comment': '#6c7086',
+        'Token.Generic.Inserted': '#a6e3a1',
+        'Token.Generic.Deleted': '#f38ba8',
+        'Token.Generic.Heading': '#89b4fa',
+        'Token.Generic.Subheading': '#89b4fa',
+    }
+
+    # Larger blocks are shown as plain text
+    MAX_CHARS = 50000
+
+    CACHE_SIZE = 256
+    CACHE_MAX_CHARS = 4 * 1024 * 1024
+    _cache: "OrderedDict[Tuple[str, bytes], str]" = OrderedDict()
+    _cache_chars = 0
+    _cache_lock = threading.Lock()
+    _token_colors: Dict[object, Optional[str]] = {}
+
+    @classmethod
+    def available(cls) -> bool:
+        """Whether pygments is installed."""
+        return lex is not None
+
+    @classmethod
+    def can_highlight(cls, code: str, language: str) -> bool:
+        """Whether ``code`` qualifies for highlighting at all."""
+        return cls.available() and bool(language) and len(code) <= cls.MAX_CHARS
+
+    @classmethod
+    def highlight(cls, code: str, language: str) -> Optional[str]:
+        """Get highlighted HTML for ``code``, or None if it can't be highlighted."""
+        if not cls.can_highlight(code, language):
+            return None
+        key = (language.lower(), hashlib.blake2b(code.encode('utf-8'), digest_size=16).digest())
+        with cls._cache_lock:
+            result = cls._cache.get(key)
+            if result is not None:
+                cls._cache.move_to_end(key)
+                return result
+
+        try:
+            lexer = get_lexer_by_name(language, stripnl=False, ensurenl=False)
+        except ClassNotFound:
+            return None
+        result = cls._format(lex(code, lexer))
+
+        with cls._cache_lock:
+            if key not in cls._cache:
+                cls._cache[key] = result
+                cls._cache_chars += len(result)
+            while len(cls._cache) > cls.CACHE_SIZE or cls._cache_chars > cls.CACHE_MAX_CHARS:
+                _, evicted = cls._cache.popitem(last=False)
+                cls._cache_chars -= len(evicted)
+        return result
+
+    @classmethod
+    def cache_stats(cls) -> Tuple[int, int]:
+        """Number of cached blocks and their total size in characters."""
+        with cls._cache_lock:
+            return len(cls._cache), cls._cache_chars
+
+    @classmethod
+    def _format(cls, tokens) -> str:
+        """Render a token stream as escaped text with colored spans."""
+        parts = []
+        for ttype, value in tokens:
+            text = html.escape(value, quote=False)
+            color = cls._color(ttype)
+            if color and value.strip():
+                parts.append(f'<span style="color: {color};">{text}</span>')
+            else:
+                parts.append(text)
+        return "".join(parts)
+
+    @classmethod
+    def _color(cls, ttype) -> Optional[str]:
+        """Look up the color of a token type, walking up to its parents."""
+        try:
+            return cls._token_colors[ttype]
+        except KeyError:
+            pass
+        current = ttype
+        color = None
+        while current is not None:
+            color = cls.TOKEN_COLORS.get(str(current))
+            if color:
+                break
+            current = current.parent
+        cls._token_colors[ttype] = color
+        return color
@@ -0,0 +1,208 @@
+"""Virtualized list of saved conversations."""
+from typing import List, Optional
+
+from PyQt6.QtWidgets import QListView, QStyledItemDelegate, QStyleOptionViewItem, QStyle
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QSize, QRect, QRectF, pyqtSignal
+from PyQt6.QtGui import QFont, QFontMetrics, QColor, QPen, QPainter
+
+from ...core import SESSION_PAGE_SIZE
+from ...services import SessionService, SessionInfo
+from ...utils import BackgroundRunner
+
+
+class SessionListModel(QAbstractListModel):
+    """Sessions ordered by last update, fetched page by page on demand.
+
+    The view asks for more rows through ``canFetchMore``/``fetchMore`` as it
+    scrolls towards the end; each page is queried on a worker thread and
+    appended when it arrives.
+    """
+
+    SessionRole = Qt.ItemDataRole.UserRole + 1
+
+    # Emitted after each page arrives with the total number of rows
+    page_loaded = pyqtSignal(int)
+    load_failed = pyqtSignal(str)
+
+    def __init__(self, session_service: SessionService, page_size: int = SESSION_PAGE_SIZE, parent=None):
+        super().__init__(parent)
+        self.session_service = session_service
+        self.page_size = page_size
+        self._sessions: List[SessionInfo] = []
+        self._exhausted = False
+        self._fetching = False
+
+        self._loader = BackgroundRunner(max_workers=1, parent=self)
+        self._loader.result_ready.connect(self._on_page_loaded)
+        self._loader.error_occurred.connect(self._on_page_failed)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._sessions)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        session = self._sessions[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return session.get_display_name()
+        if role == Qt.ItemDataRole.UserRole:
+            return session.session_id
+        if role == self.SessionRole:
+            return session
+        return None
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        return not parent.isValid() and not self._exhausted and not self._fetching
+
+    def fetchMore(self, parent: QModelIndex):
+        if not self.canFetchMore(parent):
+            return
+        self._fetching = True
+        after = self._sessions[-1] if self._sessions else None
+        self._loader.submit("page", self.session_service.get_sessions, self.page_size, after)
+
+    def reload(self):
+        """Drop all rows and fetch the first page again."""
+        self._loader.cancel("page")
+        self.beginResetModel()
+        self._sessions = []
+        self._exhausted = False
+        self._fetching = False
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def session(self, session_id: str) -> Optional[SessionInfo]:
+        """Find a loaded session by id."""
+        for session in self._sessions:
+            if session.session_id == session_id:
+                return session
+        return None
+
+    def shutdown(self):
+        """Stop fetching pages."""
+        self._loader.shutdown()
+
+    def _on_page_loaded(self, key: str, sessions: List[SessionInfo]):
+        """Append a fetched page."""
+        self._fetching = False
+        self._exhausted = len(sessions) < self.page_size
+        if sessions:
+            row = len(self._sessions)
+            self.beginInsertRows(QModelIndex(), row, row + len(sessions) - 1)
+            self._sessions.extend(sessions)
+            self.endInsertRows()
+        self.page_loaded.emit(len(self._sessions))
+
+    def _on_page_failed(self, key: str, error: str):
+        """Stop paging after a failed query; a reload starts over."""
+        self._fetching = False
+        self._exhausted = True
+        self.load_failed.emit(error)
+
+
+class SessionDelegate(QStyledItemDelegate):
+    """Paints a session as a card with its title, message count and age."""
+
+    ROW_HEIGHT = 74
+    MARGIN = 2
+    PADDING = 8
+    RADIUS = 8
+
+    TITLE_COLOR = QColor("#cdd6f4")
+    INFO_COLOR = QColor("#8FBCBB")
+    BACKGROUND = QColor("#1e1e2e")
+    BORDER = QColor("#313244")
+    HOVER_BACKGROUND = QColor("#313244")
+    SELECTED_BACKGROUND = QColor("#45475a")
+    SELECTED_BORDER = QColor("#585b70")
+
+    # Built on first use, as fonts need a running application
+    _title_font: Optional[QFont] = None
+    _info_font: Optional[QFont] = None
+    _title_metrics: Optional[QFontMetrics] = None
+    _info_metrics: Optional[QFontMetrics] = None
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._build_theme()
+
+    @classmethod
+    def _build_theme(cls):
+        """Create the fonts and metrics shared by every session list, once."""
+        if cls._title_metrics is not None:
+            return
+        cls._title_font = QFont()
+        cls._title_font.setBold(True)
+        cls._title_font.setPointSize(11)
+        cls._info_font = QFont()
+        cls._info_font.setPixelSize(10)
+        cls._title_metrics = QFontMetrics(cls._title_font)
+        cls._info_metrics = QFontMetrics(cls._info_font)
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        session = index.data(SessionListModel.SessionRole)
+        if session is None:
+            return
+
+        card = QRectF(option.rect).adjusted(self.MARGIN + 0.5, self.MARGIN + 0.5,
+                                            -self.MARGIN - 0.5, -self.MARGIN - 0.5)
+        if option.state & QStyle.StateFlag.State_Selected:
+            background, border, border_width = self.SELECTED_BACKGROUND, self.SELECTED_BORDER, 2
+        elif option.state & QStyle.StateFlag.State_MouseOver:
+            background, border, border_width = self.HOVER_BACKGROUND, self.BORDER, 1
+        else:
+            background, border, border_width = self.BACKGROUND, self.BORDER, 1
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QPen(border, border_width))
+        painter.setBrush(background)
+        painter.drawRoundedRect(card, self.RADIUS, self.RADIUS)
+
+        content = option.rect.adjusted(self.MARGIN + self.PADDING, self.MARGIN + self.PADDING,
+                                       -self.MARGIN - self.PADDING, -self.MARGIN - self.PADDING)
+
+        # Title, wrapped to at most two lines
+        title_height = min(2 * self._title_metrics.lineSpacing(),
+                           content.height() - self._info_metrics.height())
+        title_rect = QRect(content.left(), content.top(), content.width(), title_height)
+        painter.setFont(self._title_font)
+        painter.setPen(self.TITLE_COLOR)
+        painter.drawText(
+            title_rect,
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop | Qt.TextFlag.TextWordWrap,
+            session.get_display_name()
+        )
+
+        # Info row
+        info_rect = QRect(content.left(), content.bottom() - self._info_metrics.height() + 1,
+                          content.width(), self._info_metrics.height())
+        painter.setFont(self._info_font)
+        painter.setPen(self.INFO_COLOR)
+        painter.drawText(info_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                         f"{session.message_count} messages")
+        painter.drawText(info_rect, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+                         session.get_relative_time())
+        painter.restore()
+
+
+class SessionList(QListView):
+    """Session list backed by ``SessionListModel``; rows are painted, not widgets."""
+
+    def __init__(self, session_service: SessionService, parent=None):
+        super().__init__(parent)
+        self.setObjectName("sessionList")
+        self.session_model = SessionListModel(session_service, parent=self)
+        self.setModel(self.session_model)
+        self.setItemDelegate(SessionDelegate(self))
+        # Every row has the same height, so the view never measures them all
+        self.setUniformItemSizes(True)
+        self.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self.viewport().setAttribute(Qt.WidgetAttribute.WA_Hover)
+
+    def selected_session_ids(self) -> List[str]:
+        """Get the ids of all selected sessions."""
+        return [index.data(Qt.ItemDataRole.UserRole) for index in self.selectionModel().selectedRows()]
@@ -2,5 +2,6 @@
 from .main_window import MainWindow
 from .settings_window import SettingsWindow
 from .history_window import HistoryWindow
+from .debug_window import DebugWindow
 
-__all__ = ["MainWindow", "SettingsWindow", "HistoryWindow"]
+__all__ = ["MainWindow", "SettingsWindow", "HistoryWindow", "DebugWindow"]
@@ -0,0 +1,109 @@
+"""Debug information window."""
+import os
+from typing import Optional
+
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
+    QPushButton, QLabel, QApplication
+)
+from PyQt6.QtCore import QTimer
+
+from ..widgets import ChatWidget
+
+
+def _process_rss() -> Optional[int]:
+    """Resident memory of this process in bytes, where the platform exposes it."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _format_bytes(value: Optional[int]) -> str:
+    """Format a byte count for display."""
+    if value is None:
+        return "n/a"
+    if value < 1024 * 1024:
+        return f"{value / 1024:.1f} KB"
+    return f"{value / (1024 * 1024):.1f} MB"
+
+
+class DebugWindow(QDialog):
+    """Live view of the chat view's memory use, for tracking growth over time."""
+
+    REFRESH_MS = 1000
+
+    def __init__(self, chat_widget: ChatWidget, parent=None):
+        super().__init__(parent)
+        self.chat_widget = chat_widget
+
+        self.setWindowTitle("Debug Info")
+        self.setMinimumSize(360, 300)
+
+        self._setup_ui()
+        self._refresh()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self._refresh)
+        self.refresh_timer.start(self.REFRESH_MS)
+
+    def _setup_ui(self):
+        """Setup UI."""
+        layout = QVBoxLayout(self)
+
+        form = QFormLayout()
+        self.labels = {}
+        for key, title in (
+            ("rss", "Process memory:"),
+            ("widgets", "Live widgets:"),
+            ("messages", "Messages:"),
+            ("documents", "Rendered messages:"),
+            ("document_bytes", "Rendered memory (est.):"),
+            ("budget", "Rendered memory budget:"),
+            ("html_cache", "Markdown cache:"),
+            ("code_cache", "Highlight cache:"),
+        ):
+            label = QLabel()
+            form.addRow(title, label)
+            self.labels[key] = label
+        layout.addLayout(form)
+        layout.addStretch()
+
+        # Buttons
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+
+        release_btn = QPushButton("Release Off-screen")
+        release_btn.setToolTip("Drop rendered messages that are not visible")
+        release_btn.setObjectName("resetButton")
+        release_btn.clicked.connect(self._release)
+        buttons.addWidget(release_btn)
+
+        close_btn = QPushButton("Close")
+        close_btn.setObjectName("historyButton")
+        close_btn.clicked.connect(self.accept)
+        buttons.addWidget(close_btn)
+
+        layout.addLayout(buttons)
+
+    def _refresh(self):
+        """Update the figures."""
+        stats = self.chat_widget.memory_stats()
+        self.labels["rss"].setText(_format_bytes(_process_rss()))
+        self.labels["widgets"].setText(str(len(QApplication.allWidgets())))
+        self.labels["messages"].setText(str(stats["messages"]))
+        self.labels["documents"].setText(str(stats["documents"] + stats["streams"]))
+        self.labels["document_bytes"].setText(_format_bytes(stats["document_bytes"]))
+        self.labels["budget"].setText(_format_bytes(stats["budget"]) if stats["budget"] else "unlimited")
+        self.labels["html_cache"].setText(
+            f"{stats['html_cache_entries']} entries, {_format_bytes(stats['html_cache_chars'])}"
+        )
+        self.labels["code_cache"].setText(
+            f"{stats['code_cache_entries']} entries, {_format_bytes(stats['code_cache_chars'])}"
+        )
+
+    def _release(self):
+        """Evict off-screen layouts now."""
+        self.chat_widget.delegate.release_offscreen()
+        self._refresh()
@@ -1,61 +1,19 @@
 """History window."""
+from collections import OrderedDict
+from typing import List, Tuple
+
 from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QListWidget, 
-    QListWidgetItem, QPushButton, QLabel, QMessageBox,
-    QWidget, QSplitter
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+    QMessageBox, QWidget, QSplitter, QAbstractItemView, QProgressBar,
+    QFileDialog, QInputDialog
 )
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QFont
-
-from ...services import SessionService, SessionInfo
-from ..styles import STYLESHEET
-from ..widgets import ChatWidget
-
-
-class SessionListItem(QWidget):
-    """Custom session list item."""
-    
-    def __init__(self, session_info: SessionInfo):
-        super().__init__()
-        self.session_info = session_info
-        self._setup_ui()
-
-    def _setup_ui(self):
-        """Setup UI."""
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(8, 8, 8, 8)
-        layout.setSpacing(4)
+from PyQt6.QtCore import Qt, QModelIndex, pyqtSignal
 
-        # Title
-        title = QLabel(self.session_info.get_display_name())
-        title_font = QFont()
-        title_font.setBold(True)
-        title_font.setPointSize(11)
-        title.setFont(title_font)
-        title.setWordWrap(True)
-        title.setMaximumHeight(40)  # Allow for 2 lines max
-        title.setAlignment(Qt.AlignmentFlag.AlignTop)
-        layout.addWidget(title)
-
-        # Info row
-        info_layout = QHBoxLayout()
-        info_layout.setContentsMargins(0, 0, 0, 0)
-        
-        count_label = QLabel(f"{self.session_info.message_count} messages")
-        count_label.setStyleSheet("color: #8FBCBB; font-size: 10px;")
-        info_layout.addWidget(count_label)
-        
-        info_layout.addStretch()
-        
-        time_label = QLabel(self.session_info.get_relative_time())
-        time_label.setStyleSheet("color: #8FBCBB; font-size: 10px;")
-        info_layout.addWidget(time_label)
-        
-        layout.addLayout(info_layout)
-        
-        # Set minimum height for the widget
-        self.setMinimumHeight(65)
-        self.setMaximumHeight(75)
+from ...core import config, HISTORY_PAGE_SIZE, PREVIEW_PREFETCH_COUNT
+from ...services import SessionService, DisplayMessage
+from ...utils import BackgroundRunner
+from ..widgets import ChatWidget, SessionList
+from ..widgets.chat_widget import MarkdownStyler
 
 
 class HistoryWindow(QDialog):
@@ -63,14 +21,33 @@ class HistoryWindow(QDialog):
     
     session_selected = pyqtSignal(str)
     
+    # Rows around the selected one whose previews are fetched ahead of time
+    PREFETCH_OFFSETS = (-1, 1, 2)
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.session_service = SessionService()
         self.current_session_id = None
+        self._oldest_message_id = None
+        self._bulk_running = False
+        
+        # Database access happens off the GUI thread
+        self.loader = BackgroundRunner(parent=self)
+        self.loader.result_ready.connect(self._on_loaded)
+        self.loader.error_occurred.connect(self._on_load_error)
+        self.loader.progress.connect(self._on_progress)
+        
+        # Previews of recent and neighbouring sessions are fetched ahead of
+        # time, with their markdown rendered, so browsing shows them at once.
+        # Each prefetch slot has one key, so a newer selection supersedes the
+        # prefetches still queued for an older one.
+        self._prefetch_slots = max(PREVIEW_PREFETCH_COUNT, len(self.PREFETCH_OFFSETS))
+        self._previews: "OrderedDict[str, List[DisplayMessage]]" = OrderedDict()
+        self.prefetcher = BackgroundRunner(max_workers=1, parent=self)
+        self.prefetcher.result_ready.connect(self._on_prefetched)
         
         self.setWindowTitle("Conversation History")
         self.setMinimumSize(800, 600)
-        self.setStyleSheet(STYLESHEET)
         
         self._setup_ui()
         self._load_sessions()
@@ -87,9 +64,15 @@ class HistoryWindow(QDialog):
         
         left_layout.addWidget(QLabel("Recent Conversations"))
         
-        self.session_list = QListWidget()
+        self.session_list = SessionList(self.session_service)
         self.session_list.setMinimumWidth(300)
-        self.session_list.itemClicked.connect(self._on_session_selected)
+        self.session_list.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.session_list.selectionModel().currentChanged.connect(self._on_session_selected)
+        self.session_list.selectionModel().selectionChanged.connect(self._on_selection_changed)
+        self.session_list.session_model.page_loaded.connect(self._on_sessions_loaded)
+        self.session_list.session_model.load_failed.connect(
+            lambda error: self._on_load_error("sessions", error)
+        )
         left_layout.addWidget(self.session_list)
         
         # Buttons
@@ -115,6 +98,28 @@ class HistoryWindow(QDialog):
         
         left_layout.addLayout(buttons)
         
+        # Bulk operations
+        bulk_buttons = QHBoxLayout()
+        
+        self.export_btn = QPushButton("Export")
+        self.export_btn.setToolTip("Export selected conversations to JSON")
+        self.export_btn.setObjectName("historyButton")
+        self.export_btn.setEnabled(False)
+        self.export_btn.clicked.connect(self._export_sessions)
+        bulk_buttons.addWidget(self.export_btn)
+        
+        self.cleanup_btn = QPushButton("Delete Older Than…")
+        self.cleanup_btn.setToolTip("Delete conversations older than a number of days")
+        self.cleanup_btn.setObjectName("historyButton")
+        self.cleanup_btn.clicked.connect(self._cleanup_sessions)
+        bulk_buttons.addWidget(self.cleanup_btn)
+        
+        left_layout.addLayout(bulk_buttons)
+        
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        left_layout.addWidget(self.progress_bar)
+        
         # Right panel - Preview
         right_panel = QWidget()
         right_layout = QVBoxLayout(right_panel)
@@ -124,6 +129,7 @@ class HistoryWindow(QDialog):
         
         self.preview_area = ChatWidget()
         self.preview_area.setMinimumWidth(400)
+        self.preview_area.older_requested.connect(self._load_older_preview)
         right_layout.addWidget(self.preview_area)
         
         # Close button
@@ -141,105 +147,254 @@ class HistoryWindow(QDialog):
         splitter.setSizes([300, 500])
 
     def _load_sessions(self):
-        """Load sessions from database."""
-        self.session_list.clear()
-        sessions = self.session_service.get_sessions()
-        
-        for session in sessions:
-            item = QListWidgetItem()
-            item.setData(Qt.ItemDataRole.UserRole, session.session_id)
-            
-            widget = SessionListItem(session)
-            # Ensure the widget is properly sized
-            widget.adjustSize()
-            # Set a fixed height for all items
-            item.setSizeHint(widget.size())
-            
-            self.session_list.addItem(item)
-            self.session_list.setItemWidget(item, widget)
-        
-        if not sessions:
+        """Reload the session list; pages are fetched in the background."""
+        for slot in range(self._prefetch_slots):
+            self.prefetcher.cancel(f"prefetch-{slot}")
+        self._previews.clear()
+        self.session_list.session_model.reload()
+
+    def _on_sessions_loaded(self, count: int):
+        """Warm the previews of the most recent sessions."""
+        if not count:
             self.preview_area.clear_chat()
             # No need to show a message as the empty chat area is clear enough
+        elif count <= self.session_list.session_model.page_size:
+            self._prefetch_rows(range(min(count, PREVIEW_PREFETCH_COUNT)))
 
-    def _on_session_selected(self, item: QListWidgetItem):
-        """Handle session selection."""
-        session_id = item.data(Qt.ItemDataRole.UserRole)
+    def _on_session_selected(self, current: QModelIndex, previous: QModelIndex = QModelIndex()):
+        """Handle session selection, by mouse or keyboard."""
+        if not current.isValid():
+            return
+        session_id = current.data(Qt.ItemDataRole.UserRole)
         self.current_session_id = session_id
         
-        self.load_btn.setEnabled(True)
-        self.delete_btn.setEnabled(True)
-        
         self._load_preview(session_id)
+        # Browsing usually continues to an adjacent row
+        self._prefetch_rows([current.row() + offset for offset in self.PREFETCH_OFFSETS])
+
+    def _on_selection_changed(self):
+        """Enable actions for the current selection."""
+        count = len(self.session_list.selectionModel().selectedRows())
+        busy = self._bulk_running
+        self.load_btn.setEnabled(count == 1)
+        self.delete_btn.setEnabled(count > 0 and not busy)
+        self.delete_btn.setText(f"Delete ({count})" if count > 1 else "Delete")
+        self.export_btn.setEnabled(count > 0 and not busy)
+
+    def _selected_session_ids(self) -> List[str]:
+        """Get the ids of all selected sessions."""
+        return self.session_list.selected_session_ids()
 
     def _load_preview(self, session_id: str):
-        """Load session preview."""
-        messages = self.session_service.get_messages(session_id)
+        """Show a session preview, from the cache or loaded in the background.
+        
+        Only the most recent request is delivered, so clicking through the
+        list quickly does not queue up stale previews.
+        """
+        self.loader.cancel("older")
+        messages = self._previews.get(session_id)
+        if messages is not None:
+            self._previews.move_to_end(session_id)
+            self.loader.cancel("preview")
+            self._show_preview(messages)
+        else:
+            self.loader.submit("preview", self._fetch_preview, session_id)
+
+    def _fetch_preview(self, session_id: str) -> Tuple[str, List[DisplayMessage]]:
+        """Load the latest page of a session and render its markdown.
         
+        Runs on a worker thread; the rendered HTML lands in the shared
+        markdown cache, so the preview only has to lay it out.
+        """
+        messages = self.session_service.get_display_messages(session_id, limit=HISTORY_PAGE_SIZE)
+        for message in messages:
+            MarkdownStyler.render(message.text)
+        return session_id, messages
+
+    def _prefetch_rows(self, rows):
+        """Fetch the previews of the given list rows ahead of time.
+        
+        The ``n``-th row given is fetched in prefetch slot ``n``, replacing
+        whatever an earlier call left queued there.
+        """
+        model = self.session_list.session_model
+        for slot, row in enumerate(rows):
+            key = f"prefetch-{slot}"
+            session_id = None
+            if 0 <= row < model.rowCount():
+                session_id = model.index(row).data(Qt.ItemDataRole.UserRole)
+            if session_id is None or session_id in self._previews:
+                self.prefetcher.cancel(key)
+            else:
+                self.prefetcher.submit(key, self._fetch_preview, session_id)
+
+    def _cache_preview(self, session_id: str, messages: List[DisplayMessage]):
+        """Remember a loaded preview, evicting the least recently used."""
+        self._previews[session_id] = messages
+        self._previews.move_to_end(session_id)
+        while len(self._previews) > config.preview_cache_size:
+            self._previews.popitem(last=False)
+
+    def _on_prefetched(self, key: str, result):
+        """Store a prefetched preview unless its session has gone meanwhile."""
+        session_id, messages = result
+        if self.session_list.session_model.session(session_id) is not None:
+            self._cache_preview(session_id, messages)
+
+    def _load_older_preview(self):
+        """Fetch the page of preview messages before the oldest one shown."""
+        if self.current_session_id and self._oldest_message_id is not None:
+            self.loader.submit(
+                "older", self.session_service.get_display_messages,
+                self.current_session_id, limit=HISTORY_PAGE_SIZE,
+                before_id=self._oldest_message_id
+            )
+
+    def _show_preview(self, messages):
+        """Render the preview of the current session."""
         if not messages:
             self.preview_area.clear_chat()
             return
         
         # Update header
-        for i in range(self.session_list.count()):
-            item = self.session_list.item(i)
-            if item and item.data(Qt.ItemDataRole.UserRole) == session_id:
-                widget = self.session_list.itemWidget(item)
-                if isinstance(widget, SessionListItem):
-                    self.preview_header.setText(
-                        f"Preview - {widget.session_info.get_relative_time()}"
-                    )
-                    break
+        session = self.session_list.session_model.session(self.current_session_id)
+        if session:
+            self.preview_header.setText(f"Preview - {session.get_relative_time()}")
         
         # Clear previous messages
         self.preview_area.clear_chat()
         
         # Add messages to the chat widget
-        for message in messages:
-            role = message.get('role', '')
-            content = message.get('content', '')
-            
-            if role == 'user':
-                self.preview_area.add_user_message(content)
-            elif role == 'assistant':
-                # Handle complex content structure
-                if isinstance(content, list) and len(content) > 0:
-                    if isinstance(content[0], dict) and 'text' in content[0]:
-                        text_content = content[0]['text']
-                    else:
-                        text_content = str(content)
-                else:
-                    text_content = str(content)
-                self.preview_area.add_assistant_message(text_content)
+        self.preview_area.add_messages(
+            [(message.text, message.role == 'user') for message in messages]
+        )
+        self._update_preview_paging(messages)
+
+    def _update_preview_paging(self, messages):
+        """Remember where the loaded page starts and whether more exist."""
+        if messages:
+            self._oldest_message_id = messages[0].message_id
+        self.preview_area.set_has_older(len(messages) == HISTORY_PAGE_SIZE)
+
+    def _on_loaded(self, key: str, result):
+        """Dispatch background results."""
+        if key == "preview":
+            session_id, messages = result
+            self._cache_preview(session_id, messages)
+            self._show_preview(messages)
+        elif key == "older":
+            self.preview_area.prepend_messages(
+                [(message.text, message.role == 'user') for message in result]
+            )
+            self._update_preview_paging(result)
+        elif key in ("delete", "cleanup"):
+            self._end_bulk_operation()
+            self._on_sessions_deleted(result)
+        elif key == "export":
+            self._end_bulk_operation()
+            QMessageBox.information(self, "Export", f"Exported {result} conversation(s).")
+
+    def _on_load_error(self, key: str, error: str):
+        """Report background failures."""
+        if key in ("delete", "cleanup", "export"):
+            self._end_bulk_operation()
+            QMessageBox.warning(self, "Error", f"Operation failed: {error}")
+        else:
+            QMessageBox.warning(self, "Error", f"Could not load conversation history: {error}")
+
+    def _on_progress(self, key: str, done: int, total: int):
+        """Update the bulk operation progress bar."""
+        self.progress_bar.setMaximum(max(total, 1))
+        self.progress_bar.setValue(done)
+
+    def _start_bulk_operation(self, key: str, func, *args):
+        """Run a bulk operation in the background with progress reporting."""
+        self._bulk_running = True
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.cleanup_btn.setEnabled(False)
+        self._on_selection_changed()
+        self.loader.submit(key, func, *args, progress=self.loader.progress_callback(key))
+
+    def _end_bulk_operation(self):
+        """Restore controls after a bulk operation."""
+        self._bulk_running = False
+        self.progress_bar.setVisible(False)
+        self.cleanup_btn.setEnabled(True)
+        self._on_selection_changed()
 
     def _load_session(self):
         """Load selected session."""
-        if self.current_session_id:
-            self.session_selected.emit(self.current_session_id)
+        session_ids = self._selected_session_ids()
+        if len(session_ids) == 1:
+            self.session_selected.emit(session_ids[0])
             self.accept()
 
     def _delete_session(self):
-        """Delete selected session."""
-        if not self.current_session_id:
+        """Delete the selected sessions."""
+        session_ids = self._selected_session_ids()
+        if not session_ids:
             return
         
+        if len(session_ids) == 1:
+            question = "Delete this conversation?\n\nThis cannot be undone."
+        else:
+            question = f"Delete {len(session_ids)} conversations?\n\nThis cannot be undone."
+        
         reply = QMessageBox.question(
             self,
             "Confirm Deletion",
-            "Delete this conversation?\n\nThis cannot be undone.",
+            question,
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
             QMessageBox.StandardButton.No
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            success = self.session_service.delete_session(self.current_session_id)
-            
-            if success:
-                self._load_sessions()
-                self.current_session_id = None
-                self.load_btn.setEnabled(False)
-                self.delete_btn.setEnabled(False)
-                self.preview_area.clear_chat()
-                self.preview_header.setText("Preview")
-            else:
-                QMessageBox.warning(self, "Error", "Could not delete conversation.")
+            self._start_bulk_operation("delete", self.session_service.delete_sessions, session_ids)
+
+    def _cleanup_sessions(self):
+        """Delete all sessions older than a number of days."""
+        days, ok = QInputDialog.getInt(
+            self, "Delete Older Conversations",
+            "Delete conversations not updated in the last N days:", 30, 1, 36500
+        )
+        if not ok:
+            return
+        
+        reply = QMessageBox.question(
+            self,
+            "Confirm Deletion",
+            f"Delete all conversations older than {days} days?\n\nThis cannot be undone.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+        
+        if reply == QMessageBox.StandardButton.Yes:
+            self._start_bulk_operation("cleanup", self.session_service.delete_sessions_older_than, days)
+
+    def _export_sessions(self):
+        """Export the selected sessions to a JSON file."""
+        session_ids = self._selected_session_ids()
+        if not session_ids:
+            return
+        
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Conversations", "conversations.json", "JSON files (*.json)"
+        )
+        if path:
+            self._start_bulk_operation("export", self.session_service.export_sessions, session_ids, path)
+
+    def _on_sessions_deleted(self, count: int):
+        """Refresh the list after a deletion."""
+        self.loader.cancel("preview")
+        self._load_sessions()
+        self.current_session_id = None
+        self.preview_area.clear_chat()
+        self.preview_header.setText("Preview")
+
+    def done(self, a0: int):
+        """Stop background work when the dialog closes."""
+        self.loader.shutdown()
+        self.prefetcher.shutdown()
+        self.session_list.session_model.shutdown()
+        super().done(a0)
@@ -1,15 +1,17 @@
 """Main chat window."""
+from typing import Optional
+
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QLineEdit, QPushButton, QComboBox, QLabel
 )
+from PyQt6.QtCore import Qt, QTimer
 
 from ...agent import ChatAgent
-from ...services import OllamaService, SessionService
-from ...core import config
-from ...utils import ThreadManager
+from ...services import OllamaService, SessionService, SessionSnapshot
+from ...core import config, HISTORY_PAGE_SIZE, SNAPSHOT_MESSAGES
+from ...utils import ThreadManager, BackgroundRunner
 from ..widgets import ChatWidget
-from ..styles import STYLESHEET
 
 
 class MainWindow(QMainWindow):
@@ -22,15 +24,27 @@ class MainWindow(QMainWindow):
         self.agent = ChatAgent()
         self.session_service = SessionService()
         self.thread_manager = ThreadManager()
+        self.loader = BackgroundRunner(parent=self)
+        self.loader.result_ready.connect(self._on_loaded)
+        self.loader.error_occurred.connect(self._on_load_error)
         self.current_session_id = None
+        self._oldest_message_id = None
+        self._snapshot: Optional[SessionSnapshot] = None
+        self._restore_offset: Optional[int] = None
         
         # Setup UI
         self.setWindowTitle("Desktop AI")
         self.resize(800, 600)
-        self.setStyleSheet(STYLESHEET)
         self._setup_ui()
+
+        # Show the cached model list now; refresh it in the background
+        models, _ = OllamaService.get_cached_models()
+        self._populate_models(models)
         self._refresh_models()
 
+        if config.restore_last_session:
+            self._restore_snapshot()
+
     def _setup_ui(self):
         """Setup the user interface."""
         central_widget = QWidget()
@@ -49,7 +63,7 @@ class MainWindow(QMainWindow):
         model_group.setContentsMargins(0, 0, 0, 0)
         
         model_label = QLabel("Model:")
-        model_label.setStyleSheet("margin-right: 8px;")
+        model_label.setObjectName("modelLabel")
         controls.addWidget(model_label)
         
         # Container widget for the model selector group
@@ -68,7 +82,7 @@ class MainWindow(QMainWindow):
         refresh_btn.setToolTip("Refresh available models")
         refresh_btn.setObjectName("refreshButtonIntegrated")
         refresh_btn.setFixedWidth(36)  # Smaller button
-        refresh_btn.clicked.connect(self._refresh_models)
+        refresh_btn.clicked.connect(lambda: self._refresh_models(force=True))
         model_group.addWidget(refresh_btn)
         
         controls.addWidget(model_container)
@@ -95,6 +109,7 @@ class MainWindow(QMainWindow):
 
         # Chat display
         self.chat_widget = ChatWidget()
+        self.chat_widget.older_requested.connect(self._load_older_messages)
         layout.addWidget(self.chat_widget)
 
         # Input area
@@ -114,6 +129,11 @@ class MainWindow(QMainWindow):
 
         layout.addLayout(input_layout)
 
+    def ask(self, prompt: str):
+        """Send ``prompt`` as if typed; it stays in the input box while busy."""
+        self.input_box.setText(prompt)
+        self._send_message()
+
     def _send_message(self):
         """Send a message to the agent."""
         text = self.input_box.text().strip()
@@ -129,19 +149,21 @@ class MainWindow(QMainWindow):
         
         # Start async task
         try:
-            worker = self.thread_manager.start_task(self.agent.get_response, text)
+            worker = self.thread_manager.start_task(self.agent.stream_response, text)
+            worker.chunk_ready.connect(self.chat_widget.append_stream)
             worker.result_ready.connect(self._handle_response)
             worker.error_occurred.connect(self._handle_error)
         except RuntimeError:
             self._set_input_enabled(True)
 
     def _handle_response(self, response: str):
-        """Handle agent response."""
-        self.chat_widget.add_assistant_message(response)
+        """Handle the end of a streamed agent response."""
+        self.chat_widget.finish_stream()
         self._set_input_enabled(True)
 
     def _handle_error(self, error: str):
         """Handle error."""
+        self.chat_widget.finish_stream()
         self.chat_widget.add_assistant_message(f"Error: {error}")
         self._set_input_enabled(True)
 
@@ -152,39 +174,78 @@ class MainWindow(QMainWindow):
         if enabled:
             self.input_box.setFocus()
 
-    def _refresh_models(self):
-        """Refresh available models."""
+    def _refresh_models(self, force: bool = False):
+        """Fetch the model list from Ollama unless the cached one is fresh."""
+        if force or not OllamaService.cache_is_fresh():
+            self.loader.submit("models", OllamaService.fetch_models)
+
+    def _populate_models(self, models):
+        """Fill the model selector, keeping the configured model if present."""
         # Temporarily disconnect signal
         self.model_selector.currentTextChanged.disconnect()
-        
-        models = OllamaService.get_models()
+
+        names = [model.name for model in models]
         self.model_selector.clear()
 
-        if models:
-            self.model_selector.addItems(models)
+        if names:
+            for model in models:
+                self.model_selector.addItem(model.name)
+                self.model_selector.setItemData(
+                    self.model_selector.count() - 1, self._model_tooltip(model),
+                    Qt.ItemDataRole.ToolTipRole
+                )
             # Try to restore previous selection
-            if config.model in models:
+            if config.model in names:
                 self.model_selector.setCurrentText(config.model)
             else:
                 # Use first available model
-                config.model = models[0]
-                self.agent.update_model(models[0])
-        else:
-            # No models available, add current config model
+                config.model = names[0]
+                self.agent.update_model(names[0])
+        elif config.model:
+            # No models known, keep showing the configured one
             self.model_selector.addItem(config.model)
         
         # Reconnect signal
         self.model_selector.currentTextChanged.connect(self._on_model_changed)
 
+    @staticmethod
+    def _model_tooltip(model) -> str:
+        """Describe a model's size and details for the selector."""
+        parts = [part for part in (model.parameter_size, model.quantization) if part]
+        if model.size:
+            parts.append(f"{model.size / (1024 ** 3):.1f} GB")
+        return " · ".join(parts) or model.name
+
     def _on_model_changed(self, model_name: str):
-        """Handle model change."""
+        """Switch models without leaving the conversation."""
         if model_name and model_name != config.model:
             config.model = model_name
             self.agent.update_model(model_name)
-            self._reset_chat()
+
+    def apply_settings(self, changes):
+        """Apply settings changed outside the application."""
+        if "model" in changes and changes["model"]:
+            self.model_selector.blockSignals(True)
+            if self.model_selector.findText(changes["model"]) < 0:
+                self.model_selector.addItem(changes["model"])
+            self.model_selector.setCurrentText(changes["model"])
+            self.model_selector.blockSignals(False)
+            self.agent.update_model(changes["model"])
+        if "system_prompt" in changes:
+            self.agent.update_system_prompt(changes["system_prompt"])
+        if "model_profiles" in changes:
+            self.agent.update_profile()
+        if "chat_memory_mb" in changes:
+            self.chat_widget.set_memory_budget(changes["chat_memory_mb"])
 
     def _reset_chat(self):
         """Reset the conversation."""
+        self.loader.cancel("session")
+        self.loader.cancel("older")
+        self.loader.cancel("restore")
+        self._snapshot = None
+        self._restore_offset = None
+        self._oldest_message_id = None
         self.chat_widget.clear_chat()
         self.agent.reset()
         self.current_session_id = None
@@ -196,36 +257,137 @@ class MainWindow(QMainWindow):
         dialog.session_selected.connect(self._load_session)
         dialog.exec()
 
+    def open_session(self, session_id: str):
+        """Continue an existing conversation."""
+        self._load_session(session_id)
+
     def _load_session(self, session_id: str):
-        """Load a session."""
+        """Load a session, showing only its most recent messages first."""
         try:
             self.agent.load_session(session_id)
             self.current_session_id = session_id
-            
-            # Clear and load messages
+            self.loader.cancel("older")
+            self.loader.cancel("restore")
+            self._snapshot = None
+            self._restore_offset = None
+            self._oldest_message_id = None
             self.chat_widget.clear_chat()
-            messages = self.session_service.get_messages(session_id)
-            
-            for message in messages:
-                role = message.get('role', '')
-                content = message.get('content', '')
-                
-                if role == 'user':
-                    self.chat_widget.add_user_message(content)
-                elif role == 'assistant':
-                    # Handle complex content structure
-                    if isinstance(content, list) and len(content) > 0:
-                        if isinstance(content[0], dict) and 'text' in content[0]:
-                            text_content = content[0]['text']
-                        else:
-                            text_content = str(content)
-                    else:
-                        text_content = str(content)
-                    self.chat_widget.add_assistant_message(text_content)
-                    
+            self.loader.submit(
+                "session", self.session_service.get_display_messages,
+                session_id, limit=HISTORY_PAGE_SIZE
+            )
         except Exception as e:
             self.chat_widget.add_assistant_message(f"Error loading session: {e}")
 
+    def _load_older_messages(self):
+        """Fetch the page of messages before the oldest one shown."""
+        if self.current_session_id and self._oldest_message_id is not None:
+            self.loader.submit(
+                "older", self.session_service.get_display_messages,
+                self.current_session_id, limit=HISTORY_PAGE_SIZE,
+                before_id=self._oldest_message_id
+            )
+
+    def save_snapshot(self):
+        """Remember the end of the conversation for the next start."""
+        session = self.agent.session
+        messages = self.chat_widget.recent_messages(SNAPSHOT_MESSAGES)
+        SessionService.save_snapshot(SessionSnapshot(
+            session_id=session.session_id,
+            messages=messages,
+            scroll_offset=self.chat_widget.scroll_offset()
+        ) if session is not None and messages else None)
+
+    def _restore_snapshot(self):
+        """Show the last conversation from its snapshot, then load the session.
+
+        The snapshot fills the view at once. The stored messages are fetched
+        in the background and replace it only if the conversation changed
+        since it was taken.
+        """
+        snapshot = SessionService.load_snapshot()
+        if snapshot is None:
+            return
+        self.agent.load_session(snapshot.session_id)
+        self.current_session_id = snapshot.session_id
+        self._snapshot = snapshot
+        self.chat_widget.add_messages(snapshot.messages)
+        # Applied on first show, once the view has its real size
+        self._restore_offset = snapshot.scroll_offset
+        self.loader.submit(
+            "restore", self.session_service.get_display_messages,
+            snapshot.session_id, limit=HISTORY_PAGE_SIZE
+        )
+
+    def _attach_restored(self, messages):
+        """Reconcile the snapshot with the stored conversation."""
+        snapshot, self._snapshot = self._snapshot, None
+        if snapshot is None:
+            return
+        if not messages:
+            # The conversation was deleted since the snapshot was taken
+            self._reset_chat()
+            return
+        pairs = [(message.text, message.role == 'user') for message in messages]
+        count = len(snapshot.messages)
+        if pairs[-count:] == snapshot.messages:
+            # Unchanged; the view only gains the older messages of the page
+            self.chat_widget.prepend_messages(pairs[:-count])
+        elif self.thread_manager.is_active():
+            return
+        else:
+            self.chat_widget.clear_chat()
+            self.chat_widget.add_messages(pairs)
+        self._oldest_message_id = messages[0].message_id
+        self.chat_widget.set_has_older(len(messages) == HISTORY_PAGE_SIZE)
+
+    def _on_loaded(self, key: str, messages):
+        """Show the messages of the loaded session."""
+        if key == "models":
+            self._populate_models(messages)
+            if not messages:
+                self.chat_widget.add_assistant_message(
+                    "No Ollama models were found. Please install a model to continue."
+                )
+            return
+        if key == "restore":
+            self._attach_restored(messages)
+            return
+        if key == "session":
+            self.chat_widget.add_messages(
+                [(message.text, message.role == 'user') for message in messages]
+            )
+        elif key == "older":
+            self.chat_widget.prepend_messages(
+                [(message.text, message.role == 'user') for message in messages]
+            )
+        else:
+            return
+        if messages:
+            self._oldest_message_id = messages[0].message_id
+        self.chat_widget.set_has_older(len(messages) == HISTORY_PAGE_SIZE)
+
+    def _on_load_error(self, key: str, error: str):
+        """Handle background loading errors."""
+        if key == "models":
+            # Keep the cached list; the next refresh may reach Ollama
+            print(f"Error refreshing models: {error}")
+            return
+        self.chat_widget.add_assistant_message(f"Error loading session: {error}")
+
+    def hideEvent(self, a0):
+        """Snapshot the conversation whenever the window is hidden."""
+        super().hideEvent(a0)
+        self.save_snapshot()
+
+    def showEvent(self, a0):
+        """Refresh a stale model list whenever the window is shown."""
+        super().showEvent(a0)
+        self._refresh_models()
+        if self._restore_offset is not None:
+            offset, self._restore_offset = self._restore_offset, None
+            QTimer.singleShot(0, lambda: self.chat_widget.set_scroll_offset(offset))
+
     def closeEvent(self, a0):
         """Handle close event - minimize to tray."""
         self.hide()
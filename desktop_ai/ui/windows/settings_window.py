@@ -1,12 +1,24 @@
 """Settings window."""
 from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, 
-    QTextEdit, QPushButton, QLabel
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QGroupBox,
+    QTextEdit, QPushButton, QLabel, QLineEdit, QSpinBox, QDoubleSpinBox, QMessageBox
 )
 
-from ...core import config
+from ...core import config, InferenceProfile
 from ...agent import ChatAgent
-from ..styles import STYLESHEET
+
+# Profile options edited with a spin box: label, minimum, maximum, decimals (None for integers)
+PROFILE_FIELDS = [
+    ("temperature", "Temperature:", 0.0, 2.0, 2),
+    ("top_p", "Top P:", 0.0, 1.0, 2),
+    ("top_k", "Top K:", 1, 1000, None),
+    ("repeat_penalty", "Repeat penalty:", 0.0, 5.0, 2),
+    ("seed", "Seed:", 0, 2 ** 31 - 1, None),
+    ("num_predict", "Max tokens:", 1, 1_000_000, None),
+    ("num_ctx", "Context length:", 256, 1_048_576, None),
+    ("num_thread", "CPU threads:", 1, 1024, None),
+    ("num_batch", "Batch size:", 1, 65_536, None),
+]
 
 
 class SettingsWindow(QDialog):
@@ -15,11 +27,12 @@ class SettingsWindow(QDialog):
     def __init__(self, agent: ChatAgent, parent=None):
         super().__init__(parent)
         self.agent = agent
-        
+        self.model = config.model
+        self.profile_edits = {}
+
         self.setWindowTitle("Settings")
         self.setMinimumSize(500, 300)
-        self.setStyleSheet(STYLESHEET)
-        
+
         self._setup_ui()
         self._load_settings()
 
@@ -29,11 +42,24 @@ class SettingsWindow(QDialog):
 
         # System prompt
         layout.addWidget(QLabel("System Prompt:"))
-        
+
         self.prompt_edit = QTextEdit()
         self.prompt_edit.setPlaceholderText("Enter system prompt...")
         layout.addWidget(self.prompt_edit)
 
+        # Inference profile of the current model
+        profile_box = QGroupBox(f"Model Profile: {self.model or 'no model selected'}")
+        profile_box.setToolTip("Ollama options for this model; 'Default' keeps the model's own setting")
+        profile_box.setEnabled(bool(self.model))
+        form = QFormLayout(profile_box)
+        for key, label, minimum, maximum, decimals in PROFILE_FIELDS:
+            form.addRow(label, self._option_edit(key, minimum, maximum, decimals))
+
+        self.keep_alive_edit = QLineEdit()
+        self.keep_alive_edit.setPlaceholderText("Default (e.g. 10m, 1h, -1 to keep loaded)")
+        form.addRow("Keep alive:", self.keep_alive_edit)
+        layout.addWidget(profile_box)
+
         # Buttons
         buttons = QHBoxLayout()
         buttons.addStretch()
@@ -50,12 +76,51 @@ class SettingsWindow(QDialog):
 
         layout.addLayout(buttons)
 
+    def _option_edit(self, key: str, minimum, maximum, decimals):
+        """A spin box whose lowest value, shown as 'Default', means unset."""
+        if decimals is None:
+            edit = QSpinBox()
+            edit.setRange(minimum - 1, maximum)
+        else:
+            edit = QDoubleSpinBox()
+            edit.setDecimals(decimals)
+            edit.setSingleStep(10 ** -decimals * 5)
+            edit.setRange(minimum - edit.singleStep(), maximum)
+        edit.setSpecialValueText("Default")
+        self.profile_edits[key] = edit
+        return edit
+
     def _load_settings(self):
         """Load current settings."""
         self.prompt_edit.setText(config.system_prompt)
 
+        profile = config.get_profile(self.model)
+        for key, edit in self.profile_edits.items():
+            value = getattr(profile, key)
+            edit.setValue(edit.minimum() if value is None else value)
+        self.keep_alive_edit.setText(profile.keep_alive or "")
+
+    def _read_profile(self) -> InferenceProfile:
+        """The profile entered in the form; raises ValueError if it is invalid."""
+        values = {
+            key: None if edit.value() == edit.minimum() else edit.value()
+            for key, edit in self.profile_edits.items()
+        }
+        values["keep_alive"] = self.keep_alive_edit.text().strip() or None
+        return InferenceProfile.from_dict(values)
+
     def _save_settings(self):
         """Save settings."""
+        if self.model:
+            try:
+                profile = self._read_profile()
+            except ValueError as e:
+                QMessageBox.warning(self, "Invalid Setting", str(e))
+                return
+            if profile != config.get_profile(self.model):
+                config.set_profile(self.model, profile)
+                self.agent.update_profile()
+
         new_prompt = self.prompt_edit.toPlainText().strip()
         if new_prompt and new_prompt != config.system_prompt:
             config.system_prompt = new_prompt
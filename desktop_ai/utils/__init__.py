@@ -1,4 +1,5 @@
 """Utilities module."""
-from .threading import ThreadManager, AsyncWorker
+from .threading import ThreadManager, AsyncWorker, BackgroundRunner
+from .single_instance import SingleInstance
 
-__all__ = ["ThreadManager", "AsyncWorker"]
+__all__ = ["ThreadManager", "AsyncWorker", "BackgroundRunner", "SingleInstance"]
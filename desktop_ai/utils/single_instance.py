@@ -0,0 +1,82 @@
+"""Single-instance handoff over a local socket."""
+import json
+from typing import Dict, List
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtNetwork import QLocalServer, QLocalSocket
+
+
+class SingleInstance(QObject):
+    """Owns the instance socket and receives commands from later launches.
+
+    A command is a JSON list of strings sent as one line, e.g.
+    ``["ask", "What time is it?"]``. The server answers ``ok`` once the
+    command has been queued, so the sending process can exit right away.
+    """
+
+    command_received = pyqtSignal(list)
+
+    def __init__(self, name: str, parent=None):
+        super().__init__(parent)
+        self.name = name
+        self._server = QLocalServer(self)
+        self._server.newConnection.connect(self._on_new_connection)
+        self._buffers: Dict[QLocalSocket, bytes] = {}
+
+    @staticmethod
+    def send_command(name: str, command: List[str], timeout_ms: int) -> bool:
+        """Deliver ``command`` to the running instance; False if there is none."""
+        socket = QLocalSocket()
+        socket.connectToServer(name)
+        if not socket.waitForConnected(timeout_ms):
+            return False
+        socket.write(json.dumps(command).encode('utf-8') + b"\n")
+        delivered = socket.waitForBytesWritten(timeout_ms) and socket.waitForReadyRead(timeout_ms)
+        delivered = delivered and bytes(socket.readAll().data()).strip() == b"ok"
+        socket.disconnectFromServer()
+        return delivered
+
+    def listen(self) -> bool:
+        """Start accepting commands, replacing a socket left by a crashed instance."""
+        QLocalServer.removeServer(self.name)
+        if not self._server.listen(self.name):
+            print(f"Could not listen on {self.name}: {self._server.errorString()}")
+            return False
+        return True
+
+    def close(self):
+        """Stop accepting commands and remove the socket."""
+        self._server.close()
+
+    def _on_new_connection(self):
+        """Track each pending client connection."""
+        while self._server.hasPendingConnections():
+            socket = self._server.nextPendingConnection()
+            if socket is None:
+                break
+            self._buffers[socket] = b""
+            socket.readyRead.connect(lambda socket=socket: self._on_ready_read(socket))
+            socket.disconnected.connect(lambda socket=socket: self._on_disconnected(socket))
+
+    def _on_ready_read(self, socket: QLocalSocket):
+        """Read a command line and acknowledge it."""
+        buffer = self._buffers.get(socket, b"") + bytes(socket.readAll().data())
+        if b"\n" not in buffer:
+            self._buffers[socket] = buffer
+            return
+        line = buffer.split(b"\n", 1)[0]
+        self._buffers[socket] = b""
+        try:
+            command = json.loads(line.decode('utf-8'))
+        except ValueError:
+            command = None
+        if not isinstance(command, list) or not all(isinstance(arg, str) for arg in command):
+            socket.write(b"error\n")
+            return
+        socket.write(b"ok\n")
+        socket.flush()
+        self.command_received.emit(command)
+
+    def _on_disconnected(self, socket: QLocalSocket):
+        """Forget a client once it has gone."""
+        self._buffers.pop(socket, None)
+        socket.deleteLater()
@@ -1,42 +1,72 @@
 """Simplified threading utilities."""
 import asyncio
-from typing import Callable
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
 from PyQt6.QtCore import QThread, QObject, pyqtSignal
 
 
 class AsyncWorker(QObject):
-    """Worker for async operations."""
+    """Worker for async operations.
+    
+    ``async_func`` may also be an async generator function; each item it
+    yields is emitted through ``chunk_ready`` and ``result_ready`` receives
+    the concatenated text. The coroutine runs on ``loop`` if one is set,
+    otherwise on a new event loop that is closed afterwards.
+    """
     
     result_ready = pyqtSignal(object)
     error_occurred = pyqtSignal(str)
+    chunk_ready = pyqtSignal(str)
     
     def __init__(self, async_func: Callable, *args, **kwargs):
         super().__init__()
         self.async_func = async_func
         self.args = args
         self.kwargs = kwargs
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
     
     def run(self):
         """Execute the async function."""
-        loop = asyncio.new_event_loop()
+        owns_loop = self.loop is None
+        loop = asyncio.new_event_loop() if owns_loop else self.loop
         try:
             asyncio.set_event_loop(loop)
-            result = loop.run_until_complete(
-                self.async_func(*self.args, **self.kwargs)
-            )
+            result = self.async_func(*self.args, **self.kwargs)
+            if inspect.isasyncgen(result):
+                result = loop.run_until_complete(self._consume(result))
+            else:
+                result = loop.run_until_complete(result)
             self.result_ready.emit(result)
         except Exception as e:
             self.error_occurred.emit(str(e))
         finally:
-            loop.close()
+            asyncio.set_event_loop(None)
+            if owns_loop:
+                loop.close()
+    
+    async def _consume(self, stream) -> str:
+        """Emit every chunk of an async generator and return them joined."""
+        chunks = []
+        async for chunk in stream:
+            chunks.append(chunk)
+            self.chunk_ready.emit(chunk)
+        return "".join(chunks)
 
 
 class ThreadManager:
-    """Simple thread manager."""
+    """Simple thread manager.
+    
+    Tasks run one at a time, each on a new thread but all on the same event
+    loop. Clients that keep connections open, like the agent's HTTP client,
+    can therefore be reused from one task to the next.
+    """
     
     def __init__(self):
         self._thread = None
         self._worker = None
+        self._loop = asyncio.new_event_loop()
     
     def is_active(self) -> bool:
         """Check if thread is running."""
@@ -49,6 +79,7 @@ class ThreadManager:
         
         self._thread = QThread()
         self._worker = AsyncWorker(async_func, *args, **kwargs)
+        self._worker.loop = self._loop
         self._worker.moveToThread(self._thread)
         
         # Connect signals
@@ -67,3 +98,74 @@ class ThreadManager:
         """Clean up references."""
         self._thread = None
         self._worker = None
+
+
+class BackgroundRunner(QObject):
+    """Runs blocking calls on worker threads and reports back through signals.
+
+    Every request has a key. Submitting a new request for a key supersedes
+    the previous one: if it has not started it is skipped, and if it is
+    already running its result is dropped. Rapid clicks therefore only
+    deliver the last-selected item.
+    """
+    
+    result_ready = pyqtSignal(str, object)
+    error_occurred = pyqtSignal(str, str)
+    progress = pyqtSignal(str, int, int)
+    
+    # Internal hop from the worker thread back to the thread owning the runner
+    _finished = pyqtSignal(str, int, object, str)
+    
+    def __init__(self, max_workers: int = 2, parent=None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._finished.connect(self._deliver)
+    
+    def submit(self, key: str, func: Callable, *args, **kwargs):
+        """Run ``func(*args, **kwargs)`` in the background under ``key``."""
+        with self._lock:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+        self._executor.submit(self._run, key, generation, func, args, kwargs)
+    
+    def progress_callback(self, key: str) -> Callable[[int, int], None]:
+        """Return a ``(done, total)`` callback that emits ``progress`` for ``key``."""
+        return lambda done, total: self.progress.emit(key, done, total)
+    
+    def cancel(self, key: str):
+        """Drop any pending or running request for ``key``."""
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+    
+    def shutdown(self):
+        """Stop accepting work and discard queued requests."""
+        with self._lock:
+            for key in self._generations:
+                self._generations[key] += 1
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _is_current(self, key: str, generation: int) -> bool:
+        with self._lock:
+            return self._generations.get(key) == generation
+    
+    def _run(self, key: str, generation: int, func: Callable, args, kwargs):
+        """Worker thread body."""
+        if not self._is_current(key, generation):
+            return
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self._finished.emit(key, generation, None, str(e) or type(e).__name__)
+            return
+        self._finished.emit(key, generation, result, "")
+    
+    def _deliver(self, key: str, generation: int, result: object, error: str):
+        """Emit the public signals on the runner's thread if still current."""
+        if not self._is_current(key, generation):
+            return
+        if error:
+            self.error_occurred.emit(key, error)
+        else:
+            self.result_ready.emit(key, result)
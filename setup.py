@@ -10,6 +10,9 @@ setup(
         "markdown2",
         "ollama"
     ],
+    extras_require={
+        "highlight": ["Pygments"],
+    },
     entry_points={
         "console_scripts": [
             "desktop-ai = desktop_ai.main:main",
@@ -17,5 +20,5 @@ setup(
     },
     description="A simple desktop AI chat application with system tray integration",
     author="Juan Ezquerro LLanes",
-    python_requires=">=3.8",
+    python_requires=">=3.9",
 )